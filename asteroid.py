@@ -1,12 +1,8 @@
-import pygame
-from circleshape import CircleShape
+from entitystore import StoredShape
+
+# Position and velocity live in Asteroid.store and are integrated in bulk
+class Asteroid(StoredShape):
+    outline_color = "lightgray"
 
-class Asteroid(CircleShape):
     def __init__(self, x, y, radius):
         super().__init__(x, y, radius)
-    
-    def draw(self, screen):
-        pygame.draw.circle(screen, "lightgray", self.position, self.radius, 2)
-    
-    def update(self, dt):
-        self.position += self.velocity * dt
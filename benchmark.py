@@ -0,0 +1,401 @@
+# Performance benchmarks for the game systems
+# Run with:
+#   python benchmark.py micro                        # component micro-benchmarks
+#   python benchmark.py scenarios --out new.json     # full-frame scenarios
+#   python benchmark.py scenarios --tree web         # same, against the web/ build
+#   python benchmark.py compare old.json new.json
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+# Scenarios can run against the web/ copy of the game modules, so that tree
+# has to be first on the import path before any game module is loaded
+ROOT = os.path.dirname(os.path.abspath(__file__))
+TREE = sys.argv[sys.argv.index("--tree") + 1] if "--tree" in sys.argv[:-1] else "."
+sys.path.insert(0, os.path.normpath(os.path.join(ROOT, TREE)))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from constants import *
+from circleshape import CircleShape
+from collision import collide_circles, grid_pairs, shape_arrays
+from check_collision import check_collide_circles, per_pair_hits, random_shapes
+from entitystore import EntityStore, StoredShape
+
+
+def bench_collision_pairs():
+    print("Shot/asteroid collision check per frame (per-pair loop, all-pairs kernel, grid broad phase)")
+    print(f"{'asteroids':>10} {'shots':>8} {'all pairs':>10} {'grid pairs':>11} "
+          f"{'per-pair ms':>12} {'all ms':>8} {'grid ms':>8}")
+    random.seed(1)
+    asteroid_radii = [ASTEROID_MIN_RADIUS * kind for kind in range(1, ASTEROID_KINDS + 1)]
+    for asteroid_count, shot_count in ((10, 10), (100, 100), (500, 500), (1000, 1000), (3000, 1000)):
+        asteroids = random_shapes(asteroid_count, asteroid_radii)
+        shots = random_shapes(shot_count, [SHOT_RADIUS])
+        _, asteroid_centers, asteroid_radii_array = shape_arrays(asteroids)
+        _, shot_centers, shot_radii = shape_arrays(shots)
+        candidates, _ = grid_pairs(asteroid_centers, asteroid_radii_array, shot_centers, shot_radii)
+
+        # The Python loop is too slow to be worth timing on the big fields
+        per_pair_ms = float("nan")
+        if asteroid_count * shot_count <= 250_000:
+            start = time.perf_counter()
+            per_pair_hits(asteroids, shots)
+            per_pair_ms = (time.perf_counter() - start) * 1000
+
+        timings = []
+        for use_grid in (False, True):
+            start = time.perf_counter()
+            collide_circles(asteroid_centers, asteroid_radii_array, shot_centers, shot_radii, use_grid=use_grid)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        print(f"{asteroid_count:>10} {shot_count:>8} {asteroid_count * shot_count:>10} {len(candidates):>11} "
+              f"{per_pair_ms:>12.2f} {timings[0]:>8.3f} {timings[1]:>8.3f}")
+
+
+class Mover(CircleShape):
+    """Per-object integration, the way asteroids used to update"""
+    def update(self, dt):
+        self.position += self.velocity * dt
+
+
+class StoredMover(StoredShape):
+    store = None
+
+
+def bench_integration(frames=120):
+    print("Position update per frame (per-object sprites vs entity store)")
+    print(f"{'entities':>10} {'sprites ms':>11} {'store ms':>9}")
+    for count in (100, 1000, 10000):
+        group = pygame.sprite.Group()
+        StoredMover.store = EntityStore()
+        for i in range(count):
+            mover = Mover(i, i, ASTEROID_MIN_RADIUS)
+            mover.velocity = pygame.Vector2(30, 40)
+            group.add(mover)
+            StoredMover(i, i, ASTEROID_MIN_RADIUS).velocity = pygame.Vector2(30, 40)
+
+        start = time.perf_counter()
+        for _ in range(frames):
+            group.update(1 / 60)
+        sprites_ms = (time.perf_counter() - start) * 1000 / frames
+
+        start = time.perf_counter()
+        for _ in range(frames):
+            StoredMover.store.integrate(1 / 60)
+        store_ms = (time.perf_counter() - start) * 1000 / frames
+
+        print(f"{count:>10} {sprites_ms:>11.3f} {store_ms:>9.3f}")
+
+
+def bench_hud_text(calls=5000):
+    from fonts import TextCache, draw_text
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    timers = [f"{i // 6000 % 60:02d}:{i // 100 % 60:02d}:{i % 100:02d}" for i in range(calls)]
+
+    print("Timer text per frame (through a text cache vs rendered fresh)")
+    cache = TextCache()
+    start = time.perf_counter()
+    for text in timers:
+        screen.blit(cache.render(text, 36, (255, 255, 255)), (0, 0))
+    cached_ms = (time.perf_counter() - start) * 1000 / calls
+
+    start = time.perf_counter()
+    for text in timers:
+        draw_text(screen, text, 36, (255, 255, 255), (0, 0))
+    fresh_ms = (time.perf_counter() - start) * 1000 / calls
+    print(f"{'cached ms':>10} {'fresh ms':>9} {'cache hit rate':>15}")
+    print(f"{cached_ms:>10.4f} {fresh_ms:>9.4f} {cache.stats()['hit_rate']:>15.2f}")
+
+
+def draw_hearts_per_pixel(screen, lives):
+    """draw_hearts as it was: one rect per lit pixel per heart"""
+    import main as game_main
+    for i in range(lives):
+        for row, pixels in enumerate(game_main.HEART_PATTERN):
+            for col, lit in enumerate(pixels):
+                if lit:
+                    pygame.draw.rect(screen, "red", (20 + i * 40 + col * 2, 20 + row * 2, 2, 2))
+
+
+def bench_hearts(frames=2000):
+    import main as game_main
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    print("Lives strip per frame (per-pixel rects vs cached sprite)")
+    print(f"{'lives':>10} {'rects ms':>9} {'sprite ms':>10}")
+    for lives in (1, 3, 10):
+        start = time.perf_counter()
+        for _ in range(frames):
+            draw_hearts_per_pixel(screen, lives)
+        rects_ms = (time.perf_counter() - start) * 1000 / frames
+
+        start = time.perf_counter()
+        for _ in range(frames):
+            game_main.draw_hearts(screen, lives)
+        sprite_ms = (time.perf_counter() - start) * 1000 / frames
+        print(f"{lives:>10} {rects_ms:>9.4f} {sprite_ms:>10.4f}")
+
+
+def bench_shop(frames=500):
+    from skincatalog import SkinCatalog
+    from save_system import SaveSystem
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    print("Shop grid per frame (visible rows only, tiles cached)")
+    print(f"{'skins':>10} {'draw ms':>8} {'hit-test us':>12}")
+    for count in (10, 100, 1000):
+        skins = {f"skin{i}": {"color": (255, 255, 255), "price": i, "name": f"Skin {i}"} for i in range(count)}
+        catalog = SkinCatalog(skins, SaveSystem(path=None))
+        catalog.scroll_by(catalog.max_scroll // 2)
+        catalog.draw(screen)  # Render the visible tiles once
+
+        start = time.perf_counter()
+        for _ in range(frames):
+            catalog.draw(screen)
+        draw_ms = (time.perf_counter() - start) * 1000 / frames
+
+        start = time.perf_counter()
+        for i in range(frames):
+            catalog.skin_at((400 + i % 400, 200 + i % 400))
+        hit_us = (time.perf_counter() - start) * 1e6 / frames
+        print(f"{count:>10} {draw_ms:>8.3f} {hit_us:>12.2f}")
+
+
+def bench_history(sizes=(1000, 10000, 100000, 300000), queries=200):
+    from runhistory import ORDERINGS, RunHistory, insert_runs
+    rng = random.Random(0)
+
+    print("Run history queries as the table grows (bot runs plus some player runs)")
+    print(f"{'runs':>10} {'insert us/run':>14} {'top 10 ms':>10} {'best ms':>8} {'count ms':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        history = RunHistory(os.path.join(directory, "runs.db"), threaded=False)
+        db = history.database()
+        total = 0
+        for size in sizes:
+            rows = [(time.time(), "player" if rng.random() < 0.01 else "bot:spin",
+                     rng.randint(1, MAX_LEVEL), rng.uniform(1, 3600), rng.randint(0, 1000), rng.randint(0, 10000))
+                    for _ in range(size - total)]
+            start = time.perf_counter()
+            for i in range(0, len(rows), 1000):
+                insert_runs(db, rows[i:i + 1000])  # Batched, as the writer thread does
+            insert_us = (time.perf_counter() - start) * 1e6 / len(rows)
+            total = size
+
+            timings = []
+            for query in (history.top_runs, history.personal_best, history.count):
+                start = time.perf_counter()
+                for _ in range(queries):
+                    query()
+                timings.append((time.perf_counter() - start) * 1000 / queries)
+            print(f"{size:>10} {insert_us:>14.2f} {timings[0]:>10.3f} {timings[1]:>8.3f} {timings[2]:>9.3f}")
+
+        # Every leaderboard query should be answered from an index, not a sort
+        for by, order in ORDERINGS.items():
+            plan = db.execute(f"EXPLAIN QUERY PLAN SELECT * FROM runs WHERE source = 'player' "
+                              f"ORDER BY {order} LIMIT 1").fetchall()
+            print(f"personal best by {by}: {plan[-1][-1]}")
+        db.close()
+
+
+# name -> (start level, asteroids kept on the field, shots kept in flight,
+# shake rapid-fire active). None asteroids means the level's own
+# steady-state population (see field_population).
+SCENARIOS = {
+    "level_1": (1, None, 0, False),
+    "level_100": (100, None, 0, False),
+    "level_500": (500, None, 0, False),
+    "level_1000": (1000, None, 0, False),
+    "level_1000_rapid_fire": (1000, None, 0, True),
+    "level_500_shot_storm": (500, 200, 1000, True),
+}
+WARMUP_SECONDS = 1.0  # Fill the text and sprite caches before measuring
+PHASES = ("update", "collision", "render", "total")
+
+
+def summarize(samples):
+    """mean/p50/p95/p99 of a list of seconds, in milliseconds"""
+    ordered = sorted(samples)
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000
+    return {
+        "mean": sum(ordered) / len(ordered) * 1000,
+        "p50": percentile(50),
+        "p95": percentile(95),
+        "p99": percentile(99),
+    }
+
+
+def field_population(field):
+    """About how many asteroids the field holds once it has filled up: one
+    spawns every spawn rate seconds and each takes a screen width to cross"""
+    min_speed, max_speed = field.get_speed_range()
+    crossing_time = SCREEN_WIDTH / ((min_speed + max_speed) / 2)
+    return round(crossing_time / field.get_spawn_rate())
+
+
+def spawn_on_screen(field):
+    """One asteroid at a random spot on screen, moving at the level's speed"""
+    min_speed, max_speed = field.get_speed_range()
+    position = pygame.Vector2(random.uniform(0, SCREEN_WIDTH), random.uniform(0, SCREEN_HEIGHT))
+    velocity = pygame.Vector2(random.randint(min_speed, max_speed), 0).rotate(random.uniform(0, 360))
+    field.spawn(ASTEROID_MIN_RADIUS * random.randint(1, ASTEROID_KINDS), position, velocity)
+
+
+def run_scenario(name, frames, seed=0):
+    import main as game_main  # The tree's own draw helpers
+    from controls import SCRIPTS, ScriptedControls
+    from game import GameSession
+    from player import Player
+    from shot import Shot
+    from asteroid import Asteroid
+    from save_system import SaveSystem
+
+    start_level, asteroids_on_field, shots_in_flight, rapid_fire = SCENARIOS[name]
+    screen = pygame.display.get_surface()
+    random.seed(seed)
+    # Only rapid-fire scenarios shoot, and the field is topped up every
+    # frame, so the population stays what the scenario asks for
+    Player.controls = ScriptedControls(SCRIPTS["spin" if rapid_fire else "idle"])
+    saves = SaveSystem(path=None)
+    samples = {phase: [] for phase in PHASES}
+    populations = {"asteroids": [], "shots": []}
+
+    # The game logs every level-up and hit; keep that out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        session = GameSession(start_level=start_level, saves=saves)
+        session.player.lives = 10 ** 9  # Scenarios should never end early
+        if asteroids_on_field is None:
+            asteroids_on_field = field_population(session.asteroid_field)
+
+        for frame in range(int(WARMUP_SECONDS / FIXED_DT) + frames):
+            if rapid_fire:
+                session.player.activate_shake_effect()
+            while len(Asteroid.store) < asteroids_on_field:
+                spawn_on_screen(session.asteroid_field)
+            # Top the field up with random shots crossing the screen
+            while len(Shot.store) < shots_in_flight:
+                shot = Shot.pool.acquire(random.uniform(0, SCREEN_WIDTH), random.uniform(0, SCREEN_HEIGHT), SHOT_RADIUS)
+                shot.launch(pygame.Vector2(0, PLAYER_SHOOT_SPEED).rotate(random.uniform(0, 360)))
+            populations["asteroids"].append(len(Asteroid.store))
+            populations["shots"].append(len(Shot.store))
+            t0 = time.perf_counter()
+            session.update(FIXED_DT)
+            t1 = time.perf_counter()
+            session.check_collisions()
+            t2 = time.perf_counter()
+            game_main.draw_space_background(screen)
+            session.draw(screen)
+            game_main.draw_hearts(screen, 3)
+            game_main.draw_coins(screen, saves.get_coins())
+            game_main.draw_timer(screen, session.game_time, session.current_level, session.asteroids_killed)
+            game_main.draw_level(screen, session.current_level)
+            t3 = time.perf_counter()
+            if frame * FIXED_DT >= WARMUP_SECONDS:
+                samples["update"].append(t1 - t0)
+                samples["collision"].append(t2 - t1)
+                samples["render"].append(t3 - t2)
+                samples["total"].append(t3 - t0)
+
+    result = {phase: summarize(values) for phase, values in samples.items()}
+    # Mean population at the start of each measured frame
+    for kind, counts in populations.items():
+        counts = counts[-frames:]
+        result[kind] = round(sum(counts) / len(counts), 1)
+    return result
+
+
+def bench_scenarios(frames, names, out=None):
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    report = {
+        "tree": TREE,
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "frames": frames,
+        "scenarios": {},
+    }
+    print(f"Scenario frame times in ms ({frames} frames each, tree {TREE})")
+    print(f"{'scenario':<24} {'phase':<10} {'mean':>7} {'p50':>7} {'p95':>7} {'p99':>7}")
+    for name in names:
+        result = run_scenario(name, frames)
+        report["scenarios"][name] = result
+        for phase in PHASES:
+            stats = result[phase]
+            print(f"{name:<24} {phase:<10} {stats['mean']:>7.3f} {stats['p50']:>7.3f} {stats['p95']:>7.3f} {stats['p99']:>7.3f}")
+        print(f"{'':<24} {result['asteroids']} asteroids, {result['shots']} shots on the field (mean)")
+
+    if out:
+        with open(out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved results to {out}")
+
+
+def compare(old_path, new_path):
+    """Print new/old ratios for every scenario both runs share"""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"{old_path} (tree {old['tree']}) -> {new_path} (tree {new['tree']}), ratio < 1 is faster")
+    print(f"{'scenario':<24} {'phase':<10} {'mean':>16} {'p95':>16}")
+    for name, after in new["scenarios"].items():
+        before = old["scenarios"].get(name)
+        if before is None:
+            continue
+        for phase in PHASES:
+            row = []
+            for stat in ("mean", "p95"):
+                b, a = before[phase][stat], after[phase][stat]
+                ratio = a / b if b else float("inf")
+                row.append(f"{b:6.2f}->{a:6.2f} {ratio:4.2f}x")
+            print(f"{name:<24} {phase:<10} {row[0]:>16} {row[1]:>16}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Asteroids performance benchmarks")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("micro", help="collision, integration, HUD and run history micro-benchmarks")
+    scenarios = commands.add_parser("scenarios", help="seeded full-frame scenarios")
+    scenarios.add_argument("--frames", type=int, default=600)
+    scenarios.add_argument("--only", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    scenarios.add_argument("--out", help="write results as JSON to this file")
+    scenarios.add_argument("--tree", default=".", help="game tree to benchmark: . (desktop) or web")
+    compare_parser = commands.add_parser("compare", help="compare two saved scenario runs")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    args = parser.parse_args()
+
+    if args.command == "scenarios":
+        bench_scenarios(args.frames, args.only, args.out)
+    elif args.command == "compare":
+        compare(args.old, args.new)
+    else:
+        check_collide_circles()
+        print()
+        bench_collision_pairs()
+        print()
+        bench_integration()
+        print()
+        bench_hud_text()
+        print()
+        bench_hearts()
+        print()
+        bench_shop()
+        print()
+        bench_history()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# Correctness check for the collision kernel: collide_circles (through both
+# the all-pairs path and the grid broad phase) must find exactly the pairs
+# the plain CircleShape.collides_with loop finds.
+# Run with: python check_collision.py
+import random
+
+from constants import *
+from circleshape import CircleShape
+from collision import collide_circles, shape_arrays
+
+
+def random_shapes(count, radius_choices, margin=ASTEROID_MAX_RADIUS):
+    shapes = []
+    for _ in range(count):
+        x = random.uniform(-margin, SCREEN_WIDTH + margin)
+        y = random.uniform(-margin, SCREEN_HEIGHT + margin)
+        shapes.append(CircleShape(x, y, random.choice(radius_choices)))
+    return shapes
+
+
+def per_pair_hits(shapes_a, shapes_b):
+    """The old nested collides_with loop"""
+    hits = set()
+    for i, a in enumerate(shapes_a):
+        for j, b in enumerate(shapes_b):
+            if a.collides_with(b):
+                hits.add((i, j))
+    return hits
+
+
+def batch_hits(shapes_a, shapes_b, use_grid=None):
+    """Same check through the vectorized kernel"""
+    _, centers_a, radii_a = shape_arrays(shapes_a)
+    _, centers_b, radii_b = shape_arrays(shapes_b)
+    hits_a, hits_b = collide_circles(centers_a, radii_a, centers_b, radii_b, block_size=16, use_grid=use_grid)
+    pairs = list(zip(hits_a.tolist(), hits_b.tolist()))
+    assert pairs == sorted(pairs), "pairs must come back sorted"
+    return set(pairs)
+
+
+def check_collide_circles():
+    random.seed(2)
+    asteroid_radii = [ASTEROID_MIN_RADIUS * kind for kind in range(1, ASTEROID_KINDS + 1)]
+    cases = [(0, 5), (5, 0), (1, 300), (300, 1), (200, 500), (500, 200)]
+    for count_a, count_b in cases:
+        shapes_a = random_shapes(count_a, asteroid_radii)
+        shapes_b = random_shapes(count_b, [SHOT_RADIUS])
+        expected = per_pair_hits(shapes_a, shapes_b)
+        for use_grid in (False, True):
+            assert batch_hits(shapes_a, shapes_b, use_grid) == expected, (count_a, count_b, use_grid)
+
+    # Crowded field, far off screen and across negative coordinates
+    shapes_a = random_shapes(300, asteroid_radii, margin=5000)
+    shapes_b = random_shapes(300, [SHOT_RADIUS, 100], margin=5000)
+    assert batch_hits(shapes_a, shapes_b, True) == per_pair_hits(shapes_a, shapes_b)
+    crowd = [CircleShape(random.uniform(0, 50), random.uniform(0, 50), 3) for _ in range(200)]
+    assert batch_hits(crowd, crowd, True) == per_pair_hits(crowd, crowd)
+
+    # Circles that exactly touch count as colliding, whichever path runs
+    touching = [CircleShape(0, 0, 10), CircleShape(30, 40, 40)]
+    for use_grid in (False, True):
+        assert batch_hits(touching[:1], touching[1:], use_grid) == {(0, 0)}
+    print("collide_circles matches collides_with")
+
+
+if __name__ == "__main__":
+    check_collide_circles()
@@ -12,8 +12,17 @@ class CircleShape(pygame.sprite.Sprite):
         self.position = pygame.Vector2(x, y)
         self.velocity = pygame.Vector2(0, 0)
         self.radius = radius
+        self.previous_position = pygame.Vector2(x, y)
 
-    def draw(self, screen):
+    def save_previous(self):
+        # Called at the start of each simulation step
+        self.previous_position = pygame.Vector2(self.position)
+
+    def render_position(self, alpha):
+        # Where to draw: alpha of the way from the previous step to this one
+        return self.previous_position.lerp(self.position, alpha)
+
+    def draw(self, screen, alpha=1.0):
         # sub-classes must override
         pass
 
@@ -22,7 +31,7 @@ class CircleShape(pygame.sprite.Sprite):
         pass
 
     def collides_with(self, other):
-        # Calculate distance between centers
-        distance = self.position.distance_to(other.position)
-        # Check if distance is less than or equal to sum of radii
-        return distance <= (self.radius + other.radius)
+        # Compare squared distance between centers with the squared sum of radii
+        # (same result as distance <= radius sum, without the square root)
+        reach = self.radius + other.radius
+        return self.position.distance_squared_to(other.position) <= reach * reach
@@ -0,0 +1,109 @@
+import numpy as np
+
+# Rows of set A compared against all of set B at once; keeps the temporary
+# distance matrix at BLOCK_SIZE x len(B) no matter how big A gets
+BLOCK_SIZE = 64
+
+# Below this many A x B pairs comparing everything is cheaper than
+# building the grid (the player against the asteroid field, for example)
+GRID_MIN_PAIRS = 30000
+
+# The 3 x 3 block of cells around a cell, as (column, row) steps
+NEIGHBOURS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+
+def grid_pairs(centers_a, radii_a, centers_b, radii_b):
+    """Broad phase: (index_a, index_b) for every pair whose centres are in
+    the same or neighbouring cells of a uniform grid.
+
+    Cells are as wide as the largest possible reach (biggest radius in A
+    plus biggest in B), so any two circles that touch are at most one cell
+    apart. B is sorted by cell once, and each of the 9 neighbouring cells
+    of every A circle is looked up with a binary search.
+    """
+    cell_size = max(radii_a.max() + radii_b.max(), 1.0)
+    cells_a = np.floor(centers_a / cell_size).astype(np.int64)
+    cells_b = np.floor(centers_b / cell_size).astype(np.int64)
+
+    # Number the cells column by column, with a spare row and column on
+    # every side so stepping to a neighbour never wraps into another column
+    low = np.minimum(cells_a.min(axis=0), cells_b.min(axis=0)) - 1
+    height = max(cells_a[:, 1].max(), cells_b[:, 1].max()) - low[1] + 2
+    keys_a = (cells_a[:, 0] - low[0]) * height + (cells_a[:, 1] - low[1])
+    keys_b = (cells_b[:, 0] - low[0]) * height + (cells_b[:, 1] - low[1])
+
+    order_b = np.argsort(keys_b, kind="stable")
+    sorted_keys_b = keys_b[order_b]
+
+    pairs_a = []
+    pairs_b = []
+    for dx, dy in NEIGHBOURS:
+        wanted = keys_a + (dx * height + dy)
+        first = np.searchsorted(sorted_keys_b, wanted, side="left")
+        counts = np.searchsorted(sorted_keys_b, wanted, side="right") - first
+        total = counts.sum()
+        if not total:
+            continue
+        # Expand each A circle's run of matching B circles into pairs
+        index_a = np.repeat(np.arange(len(keys_a)), counts)
+        run_start = np.repeat(np.cumsum(counts) - counts, counts)
+        pairs_a.append(index_a)
+        pairs_b.append(order_b[np.repeat(first, counts) + np.arange(total) - run_start])
+
+    if not pairs_a:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+    return np.concatenate(pairs_a), np.concatenate(pairs_b)
+
+
+def collide_circles(centers_a, radii_a, centers_b, radii_b, block_size=BLOCK_SIZE, use_grid=None):
+    """Return (index_a, index_b) arrays for every pair of overlapping circles.
+
+    Circles touch when the squared distance between centres is at most the
+    squared sum of radii, the same rule as CircleShape.collides_with.
+    Pairs come back sorted by index_a, then index_b.
+
+    Large sets go through the grid_pairs broad phase first and only its
+    candidate pairs are measured; small ones are compared all-pairs.
+    use_grid forces one or the other (None picks by GRID_MIN_PAIRS).
+    """
+    centers_a = np.asarray(centers_a, dtype=float).reshape(-1, 2)
+    centers_b = np.asarray(centers_b, dtype=float).reshape(-1, 2)
+    radii_a = np.asarray(radii_a, dtype=float).reshape(-1)
+    radii_b = np.asarray(radii_b, dtype=float).reshape(-1)
+
+    if not len(centers_a) or not len(centers_b):
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+    if use_grid is None:
+        use_grid = len(centers_a) * len(centers_b) >= GRID_MIN_PAIRS
+
+    if use_grid:
+        pairs_a, pairs_b = grid_pairs(centers_a, radii_a, centers_b, radii_b)
+        dx = centers_a[pairs_a, 0] - centers_b[pairs_b, 0]
+        dy = centers_a[pairs_a, 1] - centers_b[pairs_b, 1]
+        reach = radii_a[pairs_a] + radii_b[pairs_b]
+        touching = dx * dx + dy * dy <= reach * reach
+        hits_a, hits_b = pairs_a[touching], pairs_b[touching]
+        order = np.lexsort((hits_b, hits_a))
+        return hits_a[order], hits_b[order]
+
+    hits_a = []
+    hits_b = []
+    for start in range(0, len(centers_a), block_size):
+        end = start + block_size
+        dx = centers_a[start:end, 0, None] - centers_b[:, 0]
+        dy = centers_a[start:end, 1, None] - centers_b[:, 1]
+        reach = radii_a[start:end, None] + radii_b
+        rows, cols = np.nonzero(dx * dx + dy * dy <= reach * reach)
+        hits_a.append(rows + start)
+        hits_b.append(cols)
+    return np.concatenate(hits_a), np.concatenate(hits_b)
+
+
+def shape_arrays(shapes):
+    """Pack an iterable of CircleShapes into (centers, radii) arrays"""
+    shapes = list(shapes)
+    centers = np.array([(shape.position.x, shape.position.y) for shape in shapes], dtype=float).reshape(-1, 2)
+    radii = np.array([shape.radius for shape in shapes], dtype=float)
+    return shapes, centers, radii
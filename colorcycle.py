@@ -0,0 +1,47 @@
+import math
+from constants import PLAYER_SKINS
+
+# Animated skin colours.
+# Each cycle is computed once into a lookup table and then sampled by
+# elapsed seconds, so the animation runs at the same speed at any frame rate
+# and drawing a frame costs one table index instead of any trig.
+CYCLE_STEPS = 256
+
+
+class ColorCycle:
+    def __init__(self, color_at, period, steps=CYCLE_STEPS):
+        """color_at(phase) gives the colour at phase 0..1 of the cycle;
+        one full cycle takes `period` seconds"""
+        self.period = period
+        self.table = [color_at(i / steps) for i in range(steps)]
+
+    def sample(self, seconds):
+        steps = len(self.table)
+        return self.table[int(seconds / self.period * steps) % steps]
+
+
+def rainbow(phase):
+    angle = phase * 2 * math.pi
+    r = int(127 + 127 * math.sin(angle))
+    g = int(127 + 127 * math.sin(angle + 2.09))  # 120 degrees offset
+    b = int(127 + 127 * math.sin(angle + 4.18))  # 240 degrees offset
+    return (r, g, b)
+
+
+# skin id -> cycle. Add an entry here to animate another skin.
+# The rainbow used to advance 0.1 rad per drawn frame, about 1 s per cycle at 60 FPS.
+COLOR_CYCLES = {
+    "rainbow": ColorCycle(rainbow, period=1.05),
+}
+
+
+def is_animated(skin_id):
+    return skin_id in COLOR_CYCLES
+
+
+def skin_color(skin_id, seconds=0.0):
+    """The skin's colour `seconds` into its animation (fixed skins ignore it)"""
+    cycle = COLOR_CYCLES.get(skin_id)
+    if cycle is not None:
+        return cycle.sample(seconds)
+    return PLAYER_SKINS[skin_id]["color"]
@@ -0,0 +1,65 @@
+import pygame
+
+
+# Retained-mode presenting for screens that hardly change (menu, shop,
+# game over). Each frame the caller describes the screen as named regions,
+# each a (rect, state) pair, plus a function that draws the whole scene.
+# Only regions whose rect or state changed since the last frame are redrawn
+# (the scene is drawn clipped to each of them) and sent to the display with
+# pygame.display.update(rects). A frame where nothing changed draws nothing.
+class Compositor:
+    def __init__(self):
+        self.scene = None
+        self.regions = {}
+        self.full = True
+        self.redraws = 0  # Clipped redraws since start, for the debug overlay
+
+    @property
+    def animating(self):
+        """True when some region changes every frame (so don't sleep)"""
+        return any(state is None for rect, state in self.regions.values())
+
+    def invalidate(self):
+        """Redraw and flip the whole screen next frame"""
+        self.full = True
+
+    def dirty_rects(self, regions):
+        dirty = []
+        for name, (rect, state) in regions.items():
+            previous = self.regions.get(name)
+            if previous is None:
+                dirty.append(rect)
+            elif state is None or previous != (rect, state):  # None: changes every frame
+                dirty.append(rect)
+                if previous[0] != rect:
+                    dirty.append(previous[0])  # Uncover where it used to be
+        for name, (rect, state) in self.regions.items():
+            if name not in regions:
+                dirty.append(rect)  # Gone since last frame
+        return dirty
+
+    def present(self, screen, scene, regions, draw):
+        """Bring the display up to date with scene and return the rects that
+        were updated. draw(screen) must draw the entire scene."""
+        if scene != self.scene:
+            self.scene = scene
+            self.full = True
+
+        dirty = [] if self.full else self.dirty_rects(regions)
+        self.regions = {name: (pygame.Rect(rect), state) for name, (rect, state) in regions.items()}
+
+        if self.full:
+            self.full = False
+            draw(screen)
+            pygame.display.flip()
+            return [screen.get_rect()]
+        if not dirty:
+            return dirty
+
+        for rect in dirty:
+            screen.set_clip(rect)
+            draw(screen)
+            self.redraws += 1
+        screen.set_clip(None)
+        pygame.display.update(dirty)
+        return dirty
@@ -1,6 +1,30 @@
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 
+# Game loop timing: the simulation always advances in fixed steps,
+# rendering runs as fast as the machine allows (up to MAX_RENDER_FPS)
+SIMULATION_RATE = 60  # steps per second
+FIXED_DT = 1 / SIMULATION_RATE
+MAX_CATCH_UP_STEPS = 5  # steps per frame before we give up and slow down
+MAX_RENDER_FPS = 144
+
+# Menus sleep until input arrives instead of redrawing at MAX_RENDER_FPS.
+# They still wake every IDLE_WAIT_MS; the web build, which must not block
+# the browser, checks for input every IDLE_POLL_INTERVAL seconds instead.
+# A menu with something animated on it (the rainbow skin preview) wakes
+# every ANIMATED_WAIT_MS instead, redrawing at the web polling rate.
+IDLE_WAIT_MS = 250
+IDLE_POLL_INTERVAL = 1 / 30
+ANIMATED_WAIT_MS = round(IDLE_POLL_INTERVAL * 1000)
+
+# While the window is minimized or unfocused the game is paused and only
+# wakes every SUSPENDED_WAIT_MS to redraw
+SUSPENDED_WAIT_MS = 500
+
+# Debug hotkeys: F3 toggles the frame timing overlay, F4 runs cProfile
+# over the next PROFILE_CAPTURE_FRAMES frames and saves a .pstats file
+PROFILE_CAPTURE_FRAMES = 300
+
 ASTEROID_MIN_RADIUS = 20
 ASTEROID_KINDS = 3
 ASTEROID_SPAWN_RATE = 0.8  # seconds
@@ -14,6 +38,10 @@ PLAYER_SHOOT_COOLDOWN = 0.3
 
 SHOT_RADIUS = 5
 
+# Pre-built objects per game (pools double in size if they run out)
+ASTEROID_POOL_SIZE = 64
+SHOT_POOL_SIZE = 192  # ~3 s of rapid fire at 60 FPS
+
 # Player lives/hearts
 PLAYER_LIVES = 3
 
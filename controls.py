@@ -0,0 +1,43 @@
+import pygame
+from constants import FIXED_DT
+
+
+class KeyboardControls:
+    """Reads the real keyboard"""
+    def get_pressed(self):
+        return pygame.key.get_pressed()
+
+
+class PressedKeys(frozenset):
+    """A set of key codes that can be indexed like pygame.key.get_pressed()"""
+    def __getitem__(self, key):
+        return key in self
+
+
+# Replays a fixed input script, one entry per simulation step.
+# A script is a list of (seconds, keys) segments and loops when it runs out.
+class ScriptedControls:
+    def __init__(self, script):
+        self.frames = []
+        for seconds, keys in script:
+            pressed = PressedKeys(keys)
+            self.frames.extend([pressed] * max(1, round(seconds / FIXED_DT)))
+        self.step = 0
+
+    def get_pressed(self):
+        pressed = self.frames[self.step % len(self.frames)]
+        self.step += 1
+        return pressed
+
+
+# Ready-made input scripts for headless runs
+SCRIPTS = {
+    "idle": [(1.0, [])],
+    "spin": [(1.0, [pygame.K_d, pygame.K_SPACE])],
+    "sweep": [
+        (2.0, [pygame.K_a, pygame.K_SPACE]),
+        (0.5, [pygame.K_w, pygame.K_SPACE]),
+        (2.0, [pygame.K_d, pygame.K_SPACE]),
+        (0.5, [pygame.K_s, pygame.K_SPACE]),
+    ],
+}
@@ -0,0 +1,213 @@
+import math
+import numpy as np
+import pygame
+from circleshape import CircleShape
+from surfaces import to_display_format
+
+# Structure-of-arrays storage for large numbers of moving circles.
+# Positions, velocities, radii and alive flags live in contiguous NumPy
+# arrays so the whole population can be advanced with one vectorized step.
+class EntityStore:
+    def __init__(self, capacity=64):
+        self.position = np.zeros((capacity, 2))
+        self.previous = np.zeros((capacity, 2))  # Positions at the start of the step
+        self.velocity = np.zeros((capacity, 2))
+        self.radius = np.zeros(capacity)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.entities = [None] * capacity  # slot -> owning sprite
+        self.free_slots = list(range(capacity - 1, -1, -1))
+        self.count = 0
+
+    @property
+    def capacity(self):
+        return len(self.entities)
+
+    def grow(self):
+        """Double the capacity, keeping every existing slot where it is"""
+        old = self.capacity
+        new = old * 2
+        for name in ("position", "previous", "velocity", "radius", "alive"):
+            array = getattr(self, name)
+            grown = np.zeros((new,) + array.shape[1:], dtype=array.dtype)
+            grown[:old] = array
+            setattr(self, name, grown)
+        self.entities.extend([None] * old)
+        self.free_slots.extend(range(new - 1, old - 1, -1))
+
+    def add(self, entity):
+        """Reserve a slot for the entity and return its index"""
+        if not self.free_slots:
+            self.grow()
+        slot = self.free_slots.pop()
+        self.entities[slot] = entity
+        self.activate(slot)
+        return slot
+
+    def remove(self, slot):
+        self.deactivate(slot)
+        self.entities[slot] = None
+        self.free_slots.append(slot)
+
+    def activate(self, slot):
+        self.alive[slot] = True
+        self.count += 1
+
+    def deactivate(self, slot):
+        # Dead slots keep zero velocity so integrate() can skip masking
+        self.alive[slot] = False
+        self.velocity[slot] = 0
+        self.count -= 1
+
+    def save_previous(self):
+        np.copyto(self.previous, self.position)
+
+    def integrate(self, dt):
+        """Advance every entity in one step"""
+        self.position += self.velocity * dt
+
+    def live_slots(self):
+        return np.flatnonzero(self.alive)
+
+    def render_positions(self, alpha):
+        """Return (slots, positions) of the live slots, interpolated alpha
+        of the way from the previous step"""
+        slots = self.live_slots()
+        previous = self.previous[slots]
+        return slots, previous + (self.position[slots] - previous) * alpha
+
+    def live_arrays(self):
+        """Return (entities, centers, radii) for every live slot"""
+        slots = self.live_slots()
+        entities = self.entities
+        return [entities[slot] for slot in slots], self.position[slots], self.radius[slots]
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.live_arrays()[0])
+
+
+# StoredShape outlines, one per (colour, radius), drawn the first time they are needed
+outline_sprites = {}
+
+
+# CircleShape whose state lives in a class-level EntityStore.
+# position, velocity and radius are thin views onto the store rows: reading
+# returns a fresh Vector2 copy, so always assign whole vectors back.
+class StoredShape(CircleShape):
+    lifecycle = None  # Optional LifecycleManager that despawns off-screen entities
+    pool = None  # Set on instances owned by a Pool
+    outline_color = "white"  # Colour of the default sprite() outline
+
+    @classmethod
+    def sprite(cls, radius):
+        """Surface of size 2*radius drawn centred on (radius, radius).
+        Defaults to a circle outline in outline_color."""
+        key = (cls.outline_color, radius)
+        surface = outline_sprites.get(key)
+        if surface is None:
+            surface = outline_sprites[key] = render_outline(radius, cls.outline_color)
+        return surface
+
+    @classmethod
+    def draw_all(cls, screen, alpha=1.0):
+        """Draw every live entity in the store with a single Surface.blits call"""
+        slots, positions = cls.store.render_positions(alpha)
+        if not len(slots):
+            return
+
+        # Only a handful of distinct radii exist, so look each sprite up once
+        radii, kinds = np.unique(cls.store.radius[slots], return_inverse=True)
+        sprites = [cls.sprite(radius) for radius in radii]
+        topleft = np.floor(positions) - radii[kinds, None].astype(int)
+        screen.blits(zip([sprites[kind] for kind in kinds.tolist()], topleft.astype(int).tolist()),
+                     doreturn=False)
+
+    def draw(self, screen, alpha=1.0):
+        radius = int(self.radius)
+        x, y = self.render_position(alpha)
+        screen.blit(self.sprite(radius), (math.floor(x) - radius, math.floor(y) - radius))
+
+    def __init__(self, x, y, radius):
+        self.slot = self.store.add(self)
+        super().__init__(x, y, radius)
+
+    @property
+    def position(self):
+        x, y = self.store.position[self.slot]
+        return pygame.Vector2(x, y)
+
+    @position.setter
+    def position(self, value):
+        self.store.position[self.slot] = (value[0], value[1])
+
+    @property
+    def previous_position(self):
+        x, y = self.store.previous[self.slot]
+        return pygame.Vector2(x, y)
+
+    @previous_position.setter
+    def previous_position(self, value):
+        self.store.previous[self.slot] = (value[0], value[1])
+
+    @property
+    def velocity(self):
+        x, y = self.store.velocity[self.slot]
+        return pygame.Vector2(x, y)
+
+    @velocity.setter
+    def velocity(self, value):
+        self.store.velocity[self.slot] = (value[0], value[1])
+
+    @property
+    def radius(self):
+        return self.store.radius[self.slot]
+
+    @radius.setter
+    def radius(self, value):
+        self.store.radius[self.slot] = value
+
+    def launch(self, velocity):
+        """Set the velocity and hand the entity to the lifecycle manager, if any"""
+        self.velocity = velocity
+        if self.lifecycle is not None:
+            self.lifecycle.track(self)
+
+    def respawn(self, x, y, radius):
+        """Bring a pooled instance back to life at a new spot"""
+        self.store.activate(self.slot)
+        self.position = (x, y)
+        self.previous_position = (x, y)
+        self.velocity = (0, 0)
+        self.radius = radius
+
+    def save_previous(self):
+        self.store.previous[self.slot] = self.store.position[self.slot]
+
+    def render_position(self, alpha):
+        store, slot = self.store, self.slot
+        x, y = store.previous[slot] + (store.position[slot] - store.previous[slot]) * alpha
+        return pygame.Vector2(x, y)
+
+    def alive(self):
+        return bool(self.store.alive[self.slot]) and self.store.entities[self.slot] is self
+
+    def kill(self):
+        # Pooled instances go back to their pool and keep their slot;
+        # others free the slot (only once, and only if nobody reused it)
+        if self.alive():
+            if self.pool is not None:
+                self.pool.release(self)
+            else:
+                self.store.remove(self.slot)
+        super().kill()
+
+
+def render_outline(radius, color):
+    """A circle outline on a transparent surface, for StoredShape.sprite()"""
+    radius = int(radius)
+    surface = pygame.Surface((radius * 2, radius * 2))
+    pygame.draw.circle(surface, color, (radius, radius), radius, 2)
+    # A colour key rather than per-pixel alpha: blits skip the empty middle
+    return to_display_format(surface, colorkey=(0, 0, 0))
@@ -0,0 +1,76 @@
+from collections import OrderedDict
+import pygame
+
+# Shared fonts and rendered text.
+# pygame.font.Font(None, size) reloads the default font every time it is
+# called, and most labels never change between frames, so both the fonts
+# and the rendered text surfaces are kept around and reused.
+
+fonts = {}
+
+
+def get_font(size):
+    """The default font at the given size, loaded once"""
+    font = fonts.get(size)
+    if font is None:
+        font = fonts[size] = pygame.font.Font(None, size)
+    return font
+
+
+class TextCache:
+    """Bounded LRU cache of rendered text surfaces"""
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, size, color, antialias=True):
+        key = (text, size, color, antialias)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = get_font(size).render(text, antialias, color)
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)  # Drop the least recently used
+        return surface
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+text_cache = TextCache()
+
+
+def render_text(text, size, color, antialias=True):
+    """Render text with the default font, reusing earlier renders"""
+    return text_cache.render(text, size, color, antialias)
+
+
+def draw_text(screen, text, size, color, pos, anchor="topleft"):
+    """Draw text that changes every frame (the timer, the kill counter)
+    with the given rect anchor at pos, and return its rect.
+
+    These strings are rendered fresh instead of going through text_cache:
+    each one is shown for a single frame, so caching it would only push the
+    steady labels out. One font.render also beats blitting pre-rendered
+    glyphs one by one for anything longer than two characters.
+    """
+    surface = get_font(size).render(text, True, color)
+    rect = surface.get_rect(**{anchor: pos})
+    screen.blit(surface, rect)
+    return rect
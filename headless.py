@@ -0,0 +1,86 @@
+# Runs the game simulation with no window, no real keyboard and no frame
+# limiter, as fast as the CPU allows. Useful for profiling, benchmarks and
+# regression checks.
+# Run with: python headless.py --levels 1000 --script spin --lives 1000000
+import argparse
+import contextlib
+import io
+import os
+import random
+import time
+
+# Must be set before pygame initialises the display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from constants import *
+from controls import SCRIPTS, ScriptedControls
+from game import GameSession
+from player import Player
+from save_system import SaveSystem
+from runhistory import RunHistory
+
+
+def run(levels=MAX_LEVEL, max_time=3600.0, script="spin", seed=0, lives=PLAYER_LIVES,
+        start_level=1, quiet=True, history=None):
+    """Step one game until it reaches `levels`, ends, or `max_time` game
+    seconds pass. Returns a summary dict. With a RunHistory as `history`
+    the run is recorded there, however it stopped."""
+    pygame.init()
+    random.seed(seed)
+    Player.controls = ScriptedControls(SCRIPTS[script])
+
+    # Keep coins earned by bots out of the real save file
+    session = GameSession(start_level=start_level, saves=SaveSystem(path=None),
+                          history=history, source=f"bot:{script}")
+    session.player.lives = lives
+
+    steps = 0
+    output = io.StringIO() if quiet else None
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output) if quiet else contextlib.nullcontext():
+        while (not session.game_over and session.current_level < levels
+               and session.game_time < max_time):
+            session.step(FIXED_DT)
+            steps += 1
+        if not session.game_over:
+            session.record_run()  # Game over records it otherwise
+    wall_time = time.perf_counter() - start
+
+    return {
+        "steps": steps,
+        "game_time": session.game_time,
+        "wall_time": wall_time,
+        "speedup": session.game_time / wall_time if wall_time else 0.0,
+        "level": session.current_level,
+        "asteroids_killed": session.asteroids_killed,
+        "lives": session.player.lives,
+        "game_over": session.game_over,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the game simulation headless")
+    parser.add_argument("--levels", type=int, default=MAX_LEVEL, help="stop once this level is reached")
+    parser.add_argument("--max-time", type=float, default=3600.0, help="stop after this many game seconds")
+    parser.add_argument("--script", choices=sorted(SCRIPTS), default="spin", help="scripted input to play")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--lives", type=int, default=PLAYER_LIVES)
+    parser.add_argument("--start-level", type=int, default=1)
+    parser.add_argument("--verbose", action="store_true", help="show the game's own log output")
+    parser.add_argument("--record", action="store_true", help="add the run to the leaderboard's run history")
+    args = parser.parse_args(argv)
+
+    history = RunHistory() if args.record else None
+    result = run(args.levels, args.max_time, args.script, args.seed, args.lives,
+                 args.start_level, quiet=not args.verbose, history=history)
+    if history is not None:
+        history.close()
+    print(f"Level {result['level']} after {result['game_time']:.1f}s of game time "
+          f"({result['steps']} steps, {result['asteroids_killed']} kills, {result['lives']} lives left)")
+    print(f"Took {result['wall_time']:.2f}s of wall time ({result['speedup']:.0f}x real time)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,11 @@
 import pygame
 import sys
 from constants import *
+from fonts import render_text
 
 class MainMenu:
     def __init__(self, screen):
         self.screen = screen
-        self.font_title = pygame.font.Font(None, 72)
-        self.font_button = pygame.font.Font(None, 48)
-        self.font_coin = pygame.font.Font(None, 36)
         
         # Button properties
         self.button_width = 200
@@ -67,12 +65,12 @@ class MainMenu:
             pygame.draw.circle(self.screen, (255, 255, 255), (x, y), 1)
         
         # Draw title
-        title_text = self.font_title.render("Asteroid Game", True, self.title_color)
+        title_text = render_text("Asteroid Game", 72, self.title_color)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 150))
         self.screen.blit(title_text, title_rect)
         
         # Draw coin counter
-        coin_text = self.font_coin.render(f"Coins: {coins}", True, self.coin_color)
+        coin_text = render_text(f"Coins: {coins}", 36, self.coin_color)
         coin_rect = coin_text.get_rect(topright=(SCREEN_WIDTH - 20, 20))
         self.screen.blit(coin_text, coin_rect)
         
@@ -86,6 +84,6 @@ class MainMenu:
         pygame.draw.rect(self.screen, color, rect)
         pygame.draw.rect(self.screen, self.button_text_color, rect, 2)
         
-        text_surface = self.font_button.render(text, True, self.button_text_color)
+        text_surface = render_text(text, 48, self.button_text_color)
         text_rect = text_surface.get_rect(center=rect.center)
         self.screen.blit(text_surface, text_rect)
@@ -1,46 +1,94 @@
-import pygame
 import math
+import pygame
 import time
 from circleshape import CircleShape
-from constants import PLAYER_RADIUS, PLAYER_TURN_SPEED, PLAYER_SPEED, PLAYER_SHOOT_SPEED, PLAYER_SHOOT_COOLDOWN, PLAYER_LIVES, SHAKE_EFFECT_DURATION, PLAYER_SKINS
+from constants import PLAYER_RADIUS, PLAYER_TURN_SPEED, PLAYER_SPEED, PLAYER_SHOOT_SPEED, PLAYER_SHOOT_COOLDOWN, PLAYER_LIVES, SHAKE_EFFECT_DURATION, SHOT_RADIUS
 from shot import Shot
 from save_system import save_system
+from controls import KeyboardControls
+from colorcycle import is_animated, skin_color
+from rotation import FORWARD, RIGHT, rotation_bucket
+from surfaces import to_display_format
+
+def ship_points(center, bucket, radius):
+    """The ship's triangle around center, facing heading bucket"""
+    cx, cy = center
+    fx, fy = FORWARD[bucket]
+    rx, ry = RIGHT[bucket]
+    rx, ry = rx * radius / 1.5, ry * radius / 1.5
+    return [
+        (cx + fx * radius, cy + fy * radius),
+        (cx - fx * radius - rx, cy - fy * radius - ry),
+        (cx - fx * radius + rx, cy - fy * radius + ry),
+    ]
+
+# Pre-rendered ship outlines, made the first time each heading is drawn:
+# fixed-colour skins get one surface per (colour, heading); animated skins
+# share one 8-bit surface per heading and recolour it through its palette
+ship_sprites = {}
+palette_ships = {}
+
+def sprite_half_size(radius):
+    # The back corners are sqrt(1 + 1/1.5**2) ~ 1.2 radii out, plus the line width
+    return math.ceil(radius * 1.21) + 2
+
+def render_ship(color, bucket, radius):
+    half = sprite_half_size(radius)
+    surface = pygame.Surface((half * 2, half * 2))
+    pygame.draw.polygon(surface, color, ship_points((half, half), bucket, radius), 2)
+    return to_display_format(surface, colorkey=(0, 0, 0))
+
+def render_palette_ship(bucket, radius):
+    half = sprite_half_size(radius)
+    surface = pygame.Surface((half * 2, half * 2), depth=8)
+    surface.set_palette_at(0, (0, 0, 0))
+    pygame.draw.polygon(surface, 1, ship_points((half, half), bucket, radius), 2)
+    surface.set_colorkey(0)
+    return surface
+
+def ship_sprite(skin_id, seconds, bucket, radius):
+    if is_animated(skin_id):
+        key = (bucket, radius)
+        sprite = palette_ships.get(key)
+        if sprite is None:
+            sprite = palette_ships[key] = render_palette_ship(bucket, radius)
+        sprite.set_palette_at(1, skin_color(skin_id, seconds))
+        return sprite
+    color = skin_color(skin_id)
+    key = (color, bucket, radius)
+    sprite = ship_sprites.get(key)
+    if sprite is None:
+        sprite = ship_sprites[key] = render_ship(color, bucket, radius)
+    return sprite
 
 class Player(CircleShape):
+    controls = KeyboardControls()  # Swapped for ScriptedControls in headless runs
+    
     def __init__(self, x, y):
         super().__init__(x, y, PLAYER_RADIUS)
         self.rotation = 0
+        self.previous_rotation = 0
         self.shoot_timer = 0
         self.lives = PLAYER_LIVES
         self.shake_effect_timer = 0  # Timer for shake power-up effect
         self.skin_id = save_system.get_current_skin()
-        self.rainbow_time = 0  # For rainbow skin effect
+        self.skin_time = 0  # Seconds into the skin's colour animation, if it has one
     
-    # in the player class
-    def triangle(self):
-        forward = pygame.Vector2(0, 1).rotate(self.rotation)
-        right = pygame.Vector2(0, 1).rotate(self.rotation + 90) * self.radius / 1.5
-        a = self.position + forward * self.radius
-        b = self.position - forward * self.radius - right
-        c = self.position - forward * self.radius + right
-        return [a, b, c]
+    def heading(self, alpha=1.0):
+        """Rotation bucket to draw, alpha of the way from the previous step"""
+        rotation = self.previous_rotation + (self.rotation - self.previous_rotation) * alpha
+        return rotation_bucket(rotation)
     
-    def draw(self, screen):
-        # Get skin color
-        color = self.get_skin_color()
-        pygame.draw.polygon(screen, color, self.triangle(), 2)
+    def draw(self, screen, alpha=1.0):
+        # A cached outline for this skin and heading, centred on the ship
+        sprite = ship_sprite(self.skin_id, self.skin_time, self.heading(alpha), self.radius)
+        x, y = self.render_position(alpha)
+        half = sprite.get_width() // 2
+        screen.blit(sprite, (math.floor(x) - half, math.floor(y) - half))
     
-    def get_skin_color(self):
-        """Get the current skin color, with special effects for certain skins"""
-        if self.skin_id == "rainbow":
-            # Rainbow effect - cycle through colors
-            self.rainbow_time += 0.1
-            r = int(127 + 127 * math.sin(self.rainbow_time))
-            g = int(127 + 127 * math.sin(self.rainbow_time + 2.09))  # 120 degrees offset
-            b = int(127 + 127 * math.sin(self.rainbow_time + 4.18))  # 240 degrees offset
-            return (r, g, b)
-        else:
-            return PLAYER_SKINS[self.skin_id]["color"]
+    def save_previous(self):
+        super().save_previous()
+        self.previous_rotation = self.rotation
     
     def update_skin(self):
         """Update skin from save system (call when skin changes)"""
@@ -50,15 +98,15 @@ class Player(CircleShape):
         self.rotation += PLAYER_TURN_SPEED * dt
     
     def move(self, dt):
-        forward = pygame.Vector2(0, 1).rotate(self.rotation)
-        self.position += forward * PLAYER_SPEED * dt
+        fx, fy = FORWARD[rotation_bucket(self.rotation)]
+        self.position += (fx * PLAYER_SPEED * dt, fy * PLAYER_SPEED * dt)
     
     def shoot(self):
         # Create a new shot at the player's position
-        shot = Shot(self.position.x, self.position.y)
+        shot = Shot.pool.acquire(self.position.x, self.position.y, SHOT_RADIUS)
         # Set the shot's velocity in the direction the player is facing
-        velocity = pygame.Vector2(0, 1).rotate(self.rotation)
-        shot.velocity = velocity * PLAYER_SHOOT_SPEED
+        fx, fy = FORWARD[rotation_bucket(self.rotation)]
+        shot.launch((fx * PLAYER_SHOOT_SPEED, fy * PLAYER_SHOOT_SPEED))
         # Set the cooldown timer
         self.shoot_timer = PLAYER_SHOOT_COOLDOWN
     
@@ -73,7 +121,7 @@ class Player(CircleShape):
         return self.shake_effect_timer > 0
     
     def update(self, dt):
-        keys = pygame.key.get_pressed()
+        keys = self.controls.get_pressed()
 
         if keys[pygame.K_a]:
             self.rotate(-dt)
@@ -88,6 +136,9 @@ class Player(CircleShape):
             if self.has_shake_effect() or self.shoot_timer <= 0:
                 self.shoot()
         
+        # Advance animated skins with game time, not with frames drawn
+        self.skin_time += dt
+        
         # Decrease the shoot timer
         self.shoot_timer -= dt
         
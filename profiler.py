@@ -0,0 +1,124 @@
+import cProfile
+import time
+from collections import deque
+import pygame
+from fonts import get_font, text_cache
+
+
+# Per-phase frame timings plus on-demand cProfile captures.
+# The main loop calls begin_frame(), then lap(name) after each phase of the
+# frame; a phase that runs several times in one frame (one per fixed step)
+# is summed. Timings from the last `window` frames are kept for the overlay.
+class FrameProfiler:
+    def __init__(self, window=120):
+        self.window = window
+        self.samples = {}  # phase -> deque of seconds per frame
+        self.current = {}
+        self.last_lap = time.perf_counter()
+        self.visible = False
+        self.panel_rect = pygame.Rect(10, 80, 220, 200)  # Where the overlay was last drawn
+        self.capture = None
+        self.capture_frames_left = 0
+        self.started = time.perf_counter()
+        self.suspended = False  # Window minimized or unfocused
+        self.suspended_since = 0.0
+        self.suspended_time = 0.0
+
+    def begin_frame(self):
+        self.current = {}
+        self.last_lap = time.perf_counter()
+
+    def lap(self, phase):
+        """Charge the time since the previous lap to this phase"""
+        now = time.perf_counter()
+        self.current[phase] = self.current.get(phase, 0.0) + now - self.last_lap
+        self.last_lap = now
+
+    def end_frame(self):
+        for phase, seconds in self.current.items():
+            samples = self.samples.get(phase)
+            if samples is None:
+                samples = self.samples[phase] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+        if self.capture is not None:
+            self.capture_frames_left -= 1
+            if self.capture_frames_left <= 0:
+                self.finish_capture()
+
+    def toggle_overlay(self):
+        self.visible = not self.visible
+
+    def start_capture(self, frames):
+        """Run cProfile over the next `frames` frames"""
+        if self.capture is not None:
+            return
+        self.capture = cProfile.Profile()
+        self.capture_frames_left = frames
+        self.capture.enable()
+        print(f"Profiling the next {frames} frames...")
+
+    def finish_capture(self):
+        self.capture.disable()
+        path = time.strftime("profile_%Y%m%d_%H%M%S.pstats")
+        self.capture.dump_stats(path)
+        self.capture = None
+        print(f"Saved profile to {path} (open with: python -m pstats {path})")
+
+    def set_suspended(self, suspended):
+        """Record the window going inactive or coming back"""
+        if suspended == self.suspended:
+            return
+        now = time.perf_counter()
+        if suspended:
+            self.suspended_since = now
+            print("Window inactive, suspending the game")
+        else:
+            away = now - self.suspended_since
+            self.suspended_time += away
+            print(f"Window active again after {away:.1f}s")
+        self.suspended = suspended
+
+    def activity(self):
+        """(active seconds, suspended seconds) since the profiler was created"""
+        now = time.perf_counter()
+        suspended = self.suspended_time
+        if self.suspended:
+            suspended += now - self.suspended_since
+        return now - self.started - suspended, suspended
+
+    def print_activity(self):
+        active, suspended = self.activity()
+        print(f"Session: {active:.1f}s active, {suspended:.1f}s suspended")
+
+    def averages(self):
+        """Mean milliseconds per frame for each phase over the window"""
+        return {phase: sum(samples) / len(samples) * 1000 for phase, samples in self.samples.items() if samples}
+
+    def draw(self, screen, extra_lines=()):
+        if not self.visible:
+            return
+
+        averages = self.averages()
+        total = sum(averages.values())
+        lines = [f"frame {total:6.2f} ms"]
+        lines += [f"{phase:<16} {ms:6.2f} ms" for phase, ms in averages.items()]
+        lines += list(extra_lines)
+        active, suspended = self.activity()
+        lines.append(f"active {active:.0f}s, suspended {suspended:.0f}s")
+        text_stats = text_cache.stats()
+        lines.append(f"text cache {text_stats['hits']} hits / {text_stats['misses']} misses")
+        if self.capture is not None:
+            lines.append(f"profiling... {self.capture_frames_left} frames left")
+
+        line_height = 18
+        panel = pygame.Surface((220, line_height * len(lines) + 10))
+        panel.set_alpha(190)
+        panel.fill((0, 0, 0))
+        # The numbers change every frame, so skip the text cache
+        font = get_font(20)
+        for i, line in enumerate(lines):
+            text = font.render(line, True, (120, 255, 120))
+            panel.blit(text, (8, 5 + i * line_height))
+        self.panel_rect = panel.get_rect(topleft=(10, 80))
+        screen.blit(panel, self.panel_rect)
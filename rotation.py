@@ -0,0 +1,22 @@
+import math
+
+# Unit vectors for every heading, quantized to 1 degree.
+# The player's facing only ever needs to be this precise, so the ship's
+# movement, shooting and drawing all look headings up here instead of
+# rotating a new Vector2 each time.
+ROTATION_STEPS = 360
+
+
+def unit_vector(degrees):
+    """Vector2(0, 1).rotate(degrees) as a plain tuple"""
+    radians = math.radians(degrees)
+    return (-math.sin(radians), math.cos(radians))
+
+
+FORWARD = [unit_vector(step * 360 / ROTATION_STEPS) for step in range(ROTATION_STEPS)]
+RIGHT = [unit_vector(step * 360 / ROTATION_STEPS + 90) for step in range(ROTATION_STEPS)]
+
+
+def rotation_bucket(degrees):
+    """Index into the tables for a rotation in degrees (any range)"""
+    return round(degrees * ROTATION_STEPS / 360) % ROTATION_STEPS
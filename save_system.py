@@ -1,50 +1,230 @@
+import atexit
+import copy
 import json
 import os
+import threading
 from constants import STARTING_COINS
+from savedata import apply_record, decode, default_data, encode
 
 SAVE_FILE = "game_save.json"
+SAVE_INTERVAL = 2.0  # Seconds between background writes
+
+# Journal mode: every change is appended to SAVE_FILE + JOURNAL_SUFFIX as
+# one JSON line, and after JOURNAL_COMPACT_RECORDS changes the journal is
+# folded into a fresh SAVE_FILE snapshot and emptied
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_COMPACT_RECORDS = 100
+
+def write_atomic(path, data):
+    """Write data as JSON next to path, then swap it in with one rename,
+    so a crash mid-write leaves the previous file intact"""
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w') as f:
+        f.write(encode(data))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+def write_journal(path, records, mode='a'):
+    """Append records to the journal, one JSON object per line
+    (mode='w' replaces the journal with just these records)"""
+    with open(path, mode) as f:
+        f.write("".join(json.dumps(record) + "\n" for record in records))
+        f.flush()
+        os.fsync(f.fileno())
+
+def read_journal(path):
+    """Every complete record in the journal, oldest first, and whether a
+    torn record (a write cut short by a crash) was found at the end"""
+    records = []
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    return records, True
+    return records, False
+
+# Writes save data on a background thread so the game never waits on disk.
+# save() just records the newest snapshot and append() queues journal
+# records; the thread writes at most once every `interval` seconds, so a
+# burst of changes (a purchase changes coins, owned skins and the current
+# skin) becomes a single write. Whatever is still pending is written when
+# the writer is closed, which also happens at exit.
+class SaveWriter:
+    def __init__(self, path, interval=SAVE_INTERVAL, journal_path=None):
+        self.path = path
+        self.journal_path = journal_path
+        self.interval = interval
+        self.pending = None
+        self.records = []
+        self.closed = False
+        self.writes = 0
+        self.condition = threading.Condition()
+        self.write_lock = threading.Lock()  # Only one write to the files at a time
+        self.thread = None  # Started by the first save() or append()
+
+    def start(self):
+        # Called with the condition held
+        if self.thread is None and not self.closed:
+            self.thread = threading.Thread(target=self.run, name="save-writer", daemon=True)
+            self.thread.start()
+            atexit.register(self.close)
+
+    def save(self, data):
+        with self.condition:
+            self.start()
+            self.pending = data
+            self.condition.notify()
+        if self.closed:
+            self.drain()  # Too late for the thread (e.g. saving during exit)
+
+    def append(self, record):
+        with self.condition:
+            self.start()
+            self.records.append(record)
+            self.condition.notify()
+        if self.closed:
+            self.drain()
+
+    def take(self):
+        data, records = self.pending, self.records
+        self.pending, self.records = None, []
+        return data, records
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.pending is None and not self.records and not self.closed:
+                    self.condition.wait()
+                data, records = self.take()
+                closed = self.closed
+            self.write(data, records)
+            if closed:
+                return
+            # Let further changes pile up before the next write
+            with self.condition:
+                self.condition.wait_for(lambda: self.closed, timeout=self.interval)
+
+    def drain(self):
+        with self.condition:
+            data, records = self.take()
+        self.write(data, records)
+
+    def write(self, data, records):
+        if data is None and not records:
+            return
+        with self.write_lock:
+            self.write_files(data, records)
+
+    def write_files(self, data, records):
+        try:
+            if records:
+                write_journal(self.journal_path, records)
+            if data is not None:
+                write_atomic(self.path, data)
+                if self.journal_path is not None:
+                    # The snapshot covers the journal up to its journal_seq;
+                    # keep only the records that came after it
+                    tail = [record for record in records if record["seq"] > data["journal_seq"]]
+                    write_journal(self.journal_path, tail, mode='w')
+            self.writes += 1
+        except IOError:
+            print("Failed to save game data")
+
+    def close(self):
+        """Write anything pending and stop the thread"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+            thread = self.thread
+        if thread is not None:
+            thread.join()
+        self.drain()
 
 class SaveSystem:
-    def __init__(self):
+    def __init__(self, path=SAVE_FILE, journal=False):
+        # path=None keeps everything in memory (headless runs use this).
+        # journal=True appends each change to a journal instead of
+        # rewriting the whole file every time.
+        self.path = path
+        self.journal_path = path + JOURNAL_SUFFIX if journal and path is not None else None
+        self.journal_length = 0  # Records written since the last snapshot
         self.data = self.load_data()
+        self.writer = SaveWriter(path, journal_path=self.journal_path) if path is not None else None
     
     def load_data(self):
         """Load save data from file, create default if not exists"""
-        if os.path.exists(SAVE_FILE):
+        data = None
+        if self.path is not None and os.path.exists(self.path):
             try:
-                with open(SAVE_FILE, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
+                with open(self.path, 'r') as f:
+                    data = decode(f.read())
+            except IOError:
                 pass
         
-        # Default save data
-        return {
-            "coins": STARTING_COINS,
-            "owned_skins": ["white"],  # Default skin is always owned
-            "current_skin": "white"
-        }
+        if data is None:
+            data = default_data()
+        
+        # Replay the changes made since the snapshot was taken
+        if self.journal_path is not None:
+            data.setdefault("journal_seq", 0)
+            records, torn = read_journal(self.journal_path)
+            for record in records:
+                if record["seq"] > data["journal_seq"]:
+                    apply_record(data, record)
+                    data["journal_seq"] = record["seq"]
+                    self.journal_length += 1
+            if torn:
+                # Drop the broken line so new records aren't appended after it
+                write_journal(self.journal_path, records, mode='w')
+        return data
     
     def save_data(self):
-        """Save current data to file"""
-        try:
-            with open(SAVE_FILE, 'w') as f:
-                json.dump(self.data, f, indent=2)
-        except IOError:
-            print("Failed to save game data")
+        """Queue the current data to be written to file in the background"""
+        if self.writer is None:
+            return
+        self.writer.save(copy.deepcopy(self.data))
+    
+    def change(self, record):
+        """Apply one change and persist it (as a journal record in journal mode)"""
+        apply_record(self.data, record)
+        if self.writer is None:
+            return
+        if self.journal_path is None:
+            self.save_data()
+            return
+        
+        self.data["journal_seq"] += 1
+        self.writer.append(dict(record, seq=self.data["journal_seq"]))
+        self.journal_length += 1
+        if self.journal_length >= JOURNAL_COMPACT_RECORDS:
+            self.compact()
+    
+    def compact(self):
+        """Fold the journal into a new snapshot"""
+        self.save_data()
+        self.journal_length = 0
+    
+    def close(self):
+        """Finish any pending write (also done automatically at exit)"""
+        if self.writer is not None:
+            if self.journal_length:
+                self.compact()
+            self.writer.close()
     
     def get_coins(self):
         return self.data.get("coins", STARTING_COINS)
     
     def add_coins(self, amount):
-        self.data["coins"] = self.data.get("coins", STARTING_COINS) + amount
-        self.save_data()
+        self.change({"op": "coins", "delta": amount})
     
     def spend_coins(self, amount):
         """Returns True if successful, False if not enough coins"""
         current_coins = self.data.get("coins", STARTING_COINS)
         if current_coins >= amount:
-            self.data["coins"] = current_coins - amount
-            self.save_data()
+            self.change({"op": "coins", "delta": -amount})
             return True
         return False
     
@@ -63,8 +243,7 @@ class SaveSystem:
         
         price = PLAYER_SKINS[skin_id]["price"]
         if self.spend_coins(price):
-            self.data["owned_skins"].append(skin_id)
-            self.save_data()
+            self.change({"op": "buy", "skin": skin_id})
             return True
         return False
     
@@ -74,10 +253,9 @@ class SaveSystem:
     def set_current_skin(self, skin_id):
         """Returns True if successful, False if not owned"""
         if skin_id in self.get_owned_skins():
-            self.data["current_skin"] = skin_id
-            self.save_data()
+            self.change({"op": "equip", "skin": skin_id})
             return True
         return False
 
 # Global save system instance
-save_system = SaveSystem()
+save_system = SaveSystem(journal=True)
@@ -0,0 +1,37 @@
+import json
+from constants import STARTING_COINS
+
+# The save data format, shared by the desktop save file and the web build's
+# localStorage entry so the same document works in both places.
+
+def default_data():
+    return {
+        "coins": STARTING_COINS,
+        "owned_skins": ["white"],  # Default skin is always owned
+        "current_skin": "white"
+    }
+
+def encode(data):
+    return json.dumps(data, indent=2)
+
+def decode(text):
+    """Parse a saved document; returns None if it is missing or damaged"""
+    if not text:
+        return None
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+def apply_record(data, record):
+    """Apply one change record to the save data"""
+    op = record["op"]
+    if op == "coins":
+        data["coins"] = data.get("coins", STARTING_COINS) + record["delta"]
+    elif op == "buy":
+        owned_skins = data.setdefault("owned_skins", ["white"])
+        if record["skin"] not in owned_skins:
+            owned_skins.append(record["skin"])
+    elif op == "equip":
+        data["current_skin"] = record["skin"]
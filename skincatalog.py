@@ -0,0 +1,161 @@
+import math
+import pygame
+from constants import *
+from fonts import render_text
+from surfaces import to_display_format
+from colorcycle import is_animated, skin_color
+from save_system import save_system
+
+# Shop grid layout
+ITEMS_PER_ROW = 3
+ITEM_WIDTH = 200
+ITEM_HEIGHT = 120
+ITEM_GAP_X = 20
+ITEM_GAP_Y = 30
+SHOP_VIEW = pygame.Rect(0, 150, SCREEN_WIDTH, SCREEN_HEIGHT - 150)  # Where the grid scrolls
+SCROLL_STEP = 40  # Pixels per mouse wheel notch
+
+
+def skin_status(is_owned, is_current, skin_data):
+    """Status line text and colour for a shop tile"""
+    if is_current:
+        return "EQUIPPED", (100, 255, 100)
+    elif is_owned:
+        return "OWNED", (100, 150, 255)
+    return f"{skin_data['price']} coins", (255, 215, 0)
+
+
+# Preview triangle, relative to the top left of a tile
+PREVIEW_CENTER = (ITEM_WIDTH // 2, 35)
+PREVIEW_RADIUS = 15
+PREVIEW_POINTS = [
+    (PREVIEW_CENTER[0] + PREVIEW_RADIUS * math.cos(math.radians(angle)),
+     PREVIEW_CENTER[1] + PREVIEW_RADIUS * math.sin(math.radians(angle)))
+    for angle in (0, 120, 240)  # Triangle vertices
+]
+PREVIEW_RECT = pygame.Rect(0, 0, PREVIEW_RADIUS * 2 + 4, PREVIEW_RADIUS * 2 + 4)
+PREVIEW_RECT.center = PREVIEW_CENTER
+
+
+def render_tile(skin_id, skin_data, is_owned, is_current):
+    """One shop tile: background, preview ship, name and price/status"""
+    surface = pygame.Surface((ITEM_WIDTH, ITEM_HEIGHT))
+    rect = surface.get_rect()
+
+    if is_current:
+        bg_color = (50, 150, 50)  # Green for current
+        border_color = (100, 255, 100)
+    elif is_owned:
+        bg_color = (50, 50, 150)  # Blue for owned
+        border_color = (100, 100, 255)
+    else:
+        bg_color = (50, 50, 50)   # Gray for not owned
+        border_color = (150, 150, 150)
+    pygame.draw.rect(surface, bg_color, rect)
+    pygame.draw.rect(surface, border_color, rect, 3)
+
+    # Animated skins get their preview drawn on top every frame instead
+    if not is_animated(skin_id):
+        pygame.draw.polygon(surface, skin_data["color"], PREVIEW_POINTS, 2)
+
+    name_surface = render_text(skin_data["name"], 24, (255, 255, 255))
+    surface.blit(name_surface, name_surface.get_rect(center=(ITEM_WIDTH // 2, 70)))
+
+    status_text, status_color = skin_status(is_owned, is_current, skin_data)
+    status_surface = render_text(status_text, 20, status_color)
+    surface.blit(status_surface, status_surface.get_rect(center=(ITEM_WIDTH // 2, 95)))
+
+    return to_display_format(surface)
+
+
+# Every skin on sale, laid out as a scrollable grid.
+# Tiles are rendered once and only re-rendered when their owned/equipped
+# state changes; drawing blits just the rows inside SHOP_VIEW, and finding
+# the tile under the mouse is plain grid arithmetic. Previews of animated
+# skins are the only part drawn fresh every frame.
+class SkinCatalog:
+    def __init__(self, skins=PLAYER_SKINS, saves=save_system):
+        self.skins = skins
+        self.saves = saves
+        self.skin_ids = list(skins)
+        self.tiles = {}  # skin_id -> ((is_owned, is_current), surface)
+        self.scroll = 0
+        self.left = (SCREEN_WIDTH - (ITEMS_PER_ROW * ITEM_WIDTH + (ITEMS_PER_ROW - 1) * ITEM_GAP_X)) // 2
+
+    @property
+    def rows(self):
+        return math.ceil(len(self.skin_ids) / ITEMS_PER_ROW)
+
+    @property
+    def max_scroll(self):
+        content_height = self.rows * (ITEM_HEIGHT + ITEM_GAP_Y) - ITEM_GAP_Y
+        return max(0, content_height - SHOP_VIEW.height)
+
+    def scroll_by(self, pixels):
+        self.scroll = min(max(self.scroll + pixels, 0), self.max_scroll)
+
+    def tile_rect(self, index):
+        """Where tile `index` is on screen at the current scroll position"""
+        row, col = divmod(index, ITEMS_PER_ROW)
+        x = self.left + col * (ITEM_WIDTH + ITEM_GAP_X)
+        y = SHOP_VIEW.top - self.scroll + row * (ITEM_HEIGHT + ITEM_GAP_Y)
+        return pygame.Rect(x, y, ITEM_WIDTH, ITEM_HEIGHT)
+
+    def skin_at(self, pos):
+        """The skin id under pos, or None"""
+        if not SHOP_VIEW.collidepoint(pos):
+            return None
+        x = pos[0] - self.left
+        y = pos[1] - SHOP_VIEW.top + self.scroll
+        col, col_offset = divmod(x, ITEM_WIDTH + ITEM_GAP_X)
+        row, row_offset = divmod(y, ITEM_HEIGHT + ITEM_GAP_Y)
+        if x < 0 or col >= ITEMS_PER_ROW or col_offset >= ITEM_WIDTH or row_offset >= ITEM_HEIGHT:
+            return None  # In a gap or beside the grid
+        index = int(row) * ITEMS_PER_ROW + int(col)
+        return self.skin_ids[index] if index < len(self.skin_ids) else None
+
+    def tile(self, index, owned_skins, current_skin):
+        skin_id = self.skin_ids[index]
+        state = (skin_id in owned_skins, skin_id == current_skin)
+        cached = self.tiles.get(skin_id)
+        if cached is None or cached[0] != state:
+            cached = self.tiles[skin_id] = (state, render_tile(skin_id, self.skins[skin_id], *state))
+        return cached[1]
+
+    def state(self):
+        """Everything the drawn grid depends on (for the compositor)"""
+        return (self.scroll, tuple(self.saves.get_owned_skins()), self.saves.get_current_skin())
+
+    def animated_regions(self):
+        """Compositor regions for the visible animated previews, which change every frame"""
+        regions = {}
+        for i in self.visible_indices():
+            skin_id = self.skin_ids[i]
+            if is_animated(skin_id):
+                regions[f"preview {skin_id}"] = (PREVIEW_RECT.move(self.tile_rect(i).topleft), None)
+        return regions
+
+    def visible_indices(self):
+        row_pitch = ITEM_HEIGHT + ITEM_GAP_Y
+        first_row = self.scroll // row_pitch
+        last_row = (self.scroll + SHOP_VIEW.height) // row_pitch
+        return range(first_row * ITEMS_PER_ROW, min((last_row + 1) * ITEMS_PER_ROW, len(self.skin_ids)))
+
+    def draw(self, screen, seconds=0.0):
+        """Draw the visible tiles, with animated previews `seconds` into their cycle"""
+        owned_skins = set(self.saves.get_owned_skins())
+        current_skin = self.saves.get_current_skin()
+        visible = self.visible_indices()
+        sequence = [(self.tile(i, owned_skins, current_skin), self.tile_rect(i)) for i in visible]
+
+        # Keep tiles scrolled past the top from covering the title
+        clip = screen.get_clip()
+        screen.set_clip(SHOP_VIEW.clip(clip))
+        screen.blits(sequence, doreturn=False)
+        for i in visible:
+            skin_id = self.skin_ids[i]
+            if is_animated(skin_id):
+                x, y = self.tile_rect(i).topleft
+                points = [(x + px, y + py) for px, py in PREVIEW_POINTS]
+                pygame.draw.polygon(screen, skin_color(skin_id, seconds), points, 2)
+        screen.set_clip(clip)
@@ -49,8 +49,8 @@ class AsteroidField(pygame.sprite.Sprite):
         return int(min_speed), int(max_speed)
 
     def spawn(self, radius, position, velocity):
-        asteroid = Asteroid(position.x, position.y, radius)
-        asteroid.velocity = velocity
+        asteroid = Asteroid.pool.acquire(position.x, position.y, radius)
+        asteroid.launch(velocity)
 
     def update(self, dt):
         self.spawn_timer += dt
@@ -0,0 +1,182 @@
+import pygame
+from constants import *
+from player import Player
+from asteroid import Asteroid
+from asteroidfield import AsteroidField
+from shot import Shot
+from shake import Shake
+from shakefield import ShakeField
+from entitystore import EntityStore
+from collision import collide_circles, shape_arrays
+from lifecycle import LifecycleManager
+from pool import Pool
+from save_system import save_system
+from runhistory import run_history
+
+
+def format_time(seconds):
+    """seconds as MM:SS:cc, how survival times are shown everywhere"""
+    minutes = int(seconds // 60)
+    return f"{minutes:02d}:{int(seconds % 60):02d}:{int((seconds % 1) * 100):02d}"
+
+
+# One play-through: every game object plus the simulation rules.
+# The main loop only decides how often step() runs and how the result is drawn.
+class GameSession:
+    def __init__(self, start_level=1, saves=save_system, history=run_history, source="player"):
+        self.saves = saves  # Where earned coins go
+        self.history = history  # Where the finished run is recorded (None: nowhere)
+        self.source = source  # Who played it, for the leaderboard
+        self.game_time = 0
+        self.current_level = start_level
+        self.asteroids_killed = get_asteroids_needed_for_level(start_level) if start_level > 1 else 0
+        self.coins_earned = 0
+        self.starting_level = self.current_level
+        self.game_over = False
+
+        # Create groups
+        self.updatable = pygame.sprite.Group()
+        self.drawable = pygame.sprite.Group()
+        self.shakes = pygame.sprite.Group()
+
+        # Set containers for all classes
+        Player.containers = (self.updatable, self.drawable)
+        AsteroidField.containers = (self.updatable,)
+        Shake.containers = (self.shakes, self.updatable, self.drawable)
+        ShakeField.containers = (self.updatable,)
+
+        # Asteroids and shots live in these arrays (not sprite groups)
+        # and are recycled through pools
+        Asteroid.store = EntityStore(ASTEROID_POOL_SIZE)
+        Shot.store = EntityStore(SHOT_POOL_SIZE)
+        Asteroid.pool = Pool(lambda: Asteroid(0, 0, ASTEROID_MIN_RADIUS), ASTEROID_POOL_SIZE)
+        Shot.pool = Pool(lambda: Shot(0, 0), SHOT_POOL_SIZE)
+
+        # Created first so it updates before anything spawns this tick
+        LifecycleManager.containers = (self.updatable,)
+        self.lifecycle = LifecycleManager()
+        Asteroid.lifecycle = self.lifecycle
+        Shot.lifecycle = self.lifecycle
+
+        # Create game objects
+        self.player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+        # Update player skin from save system
+        self.player.update_skin()
+        self.asteroid_field = AsteroidField()
+        self.asteroid_field.set_level(start_level)
+        self.shake_field = ShakeField()
+
+    def step(self, dt, profiler=None):
+        """Advance the simulation by dt seconds"""
+        self.update(dt)
+        if profiler:
+            profiler.lap("update")
+        self.check_collisions(profiler)
+
+    def update(self, dt):
+        """Move everything, spawn new objects and handle levelling up"""
+        player = self.player
+
+        # Remember where everything was for render interpolation
+        Asteroid.store.save_previous()
+        Shot.store.save_previous()
+        player.save_previous()
+
+        # Move all asteroids and shots with one vectorized step each
+        Asteroid.store.integrate(dt)
+        Shot.store.integrate(dt)
+
+        # Update all updatable objects
+        self.updatable.update(dt)
+
+        # Update game time
+        self.game_time += dt
+
+        # Update level based on asteroid kills
+        asteroids_needed_for_next = get_asteroids_needed_for_level(self.current_level + 1)
+        if self.asteroids_killed >= asteroids_needed_for_next and self.current_level < MAX_LEVEL:
+            self.current_level += 1
+
+            # Award coin for reaching new level
+            self.saves.add_coins(COINS_PER_LEVEL)
+            self.coins_earned += COINS_PER_LEVEL
+
+            self.asteroid_field.set_level(self.current_level)
+            print(f"Level up! Now at level {self.current_level} (killed {self.asteroids_killed} asteroids) - Earned {COINS_PER_LEVEL} coin!")
+
+    def check_collisions(self, profiler=None):
+        player = self.player
+
+        # Check for collisions between player and asteroids
+        player_center = (player.position.x, player.position.y)
+        asteroid_list, asteroid_centers, asteroid_radii = Asteroid.store.live_arrays()
+        _, asteroid_hits = collide_circles(player_center, player.radius, asteroid_centers, asteroid_radii)
+        for index in asteroid_hits:
+            if player.take_damage():
+                self.end_game()
+            else:
+                print(f"Hit! {player.lives} hearts remaining")
+            asteroid_list[index].kill()  # Remove the asteroid that hit the player
+        if profiler:
+            profiler.lap("player/asteroids")
+
+        # Check for collisions between player and shakes
+        shake_list, shake_centers, shake_radii = shape_arrays(self.shakes)
+        _, shake_hits = collide_circles(player_center, player.radius, shake_centers, shake_radii)
+        for index in shake_hits:
+            player.activate_shake_effect()
+            shake_list[index].kill()
+            print("Shake power-up collected! No shooting delay for 5 seconds!")
+        if profiler:
+            profiler.lap("player/shakes")
+
+        # Check for collisions between shots and asteroids
+        asteroid_list, asteroid_centers, asteroid_radii = Asteroid.store.live_arrays()
+        shot_list, shot_centers, shot_radii = Shot.store.live_arrays()
+        asteroid_hits, shot_hits = collide_circles(asteroid_centers, asteroid_radii, shot_centers, shot_radii)
+        for asteroid_index, shot_index in zip(asteroid_hits, shot_hits):
+            shot = shot_list[shot_index]
+            if shot.alive():  # A shot only destroys the first asteroid it hits
+                shot.kill()
+                asteroid_list[asteroid_index].kill()
+                self.asteroids_killed += 1  # Count the kill
+        if profiler:
+            profiler.lap("shots/asteroids")
+
+    def end_game(self):
+        if self.game_over:
+            return  # Several asteroids can land the last hit in the same tick
+        self.game_over = True
+
+        # Award coins for levels completed (if any)
+        levels_completed = self.current_level - self.starting_level
+        if levels_completed > 0:
+            bonus_coins = levels_completed * COINS_PER_LEVEL
+            self.saves.add_coins(bonus_coins)
+            self.coins_earned += bonus_coins
+
+        print(f"Game over! You reached level {self.current_level} and survived for {format_time(self.game_time)}")
+        print(f"Total coins earned this game: {self.coins_earned}")
+        self.record_run()
+
+    def record_run(self):
+        """Add this run to the run history"""
+        if self.history is not None:
+            self.history.record(self.current_level, self.game_time, self.coins_earned,
+                                self.asteroids_killed, self.source)
+
+    def entity_counts(self):
+        """Short summary lines for the debug overlay"""
+        return [
+            f"asteroids {len(Asteroid.store)} (pool high water {Asteroid.pool.high_water})",
+            f"shots {len(Shot.store)} (pool high water {Shot.pool.high_water})",
+            f"despawned {self.lifecycle.despawned}",
+        ]
+
+    def draw(self, screen, alpha=1.0):
+        """Draw every game object, blended alpha of the way from the previous step"""
+        # Asteroids and shots are blitted straight from their stores
+        Asteroid.draw_all(screen, alpha)
+        Shot.draw_all(screen, alpha)
+        for sprite in self.drawable:
+            sprite.draw(screen, alpha)
@@ -0,0 +1,54 @@
+import heapq
+import itertools
+import math
+import pygame
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+def exit_time(position, velocity, radius, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+    """Seconds until a circle moving in a straight line is fully off screen for good"""
+    soonest = math.inf
+    for pos, vel, size in ((position.x, velocity.x, width), (position.y, velocity.y, height)):
+        if vel > 0:
+            t = (size + radius - pos) / vel
+        elif vel < 0:
+            t = (-radius - pos) / vel
+        elif -radius < pos < size + radius:
+            continue  # Not moving on this axis and still on screen
+        else:
+            t = 0.0
+        soonest = min(soonest, t)
+    return max(soonest, 0.0)
+
+
+# Despawns entities once they have left the playfield.
+# Asteroids and shots move in straight lines, so the moment they leave the
+# screen is known when they launch; entities wait in a min-heap keyed on that
+# time and nothing has to be bounds-checked per frame.
+class LifecycleManager(pygame.sprite.Sprite):
+    def __init__(self):
+        pygame.sprite.Sprite.__init__(self, self.containers)
+        self.time = 0.0
+        self.heap = []
+        self.sequence = itertools.count()  # Also breaks ties so entities are never compared
+        self.despawned = 0
+
+    def track(self, entity):
+        t = exit_time(entity.position, entity.velocity, entity.radius)
+        # Pooled entities get reused, so remember which launch this entry is
+        # for; one that never leaves the screen must drop its old ticket too
+        entity.lifecycle_ticket = None
+        if t != math.inf:
+            entity.lifecycle_ticket = next(self.sequence)
+            heapq.heappush(self.heap, (self.time + t, entity.lifecycle_ticket, entity))
+
+    def update(self, dt):
+        self.time += dt
+        heap = self.heap
+        while heap and heap[0][0] <= self.time:
+            _, ticket, entity = heapq.heappop(heap)
+            # Entities destroyed by collisions (or since relaunched) are
+            # still queued; skip those
+            if entity.alive() and entity.lifecycle_ticket == ticket:
+                entity.kill()
+                self.despawned += 1
@@ -1,23 +1,29 @@
+# /// script
+# dependencies = [
+#     "numpy",
+# ]
+# ///
 # Web-compatible version of Asteroids Game
 import pygame
 import asyncio
 from constants import *
-from player import Player
-from asteroid import Asteroid
-from asteroidfield import AsteroidField
-from shot import Shot
-from shake import Shake
-from shakefield import ShakeField
+from game import GameSession, format_time
+from profiler import FrameProfiler
+from compositor import Compositor
+from skincatalog import SkinCatalog, SCROLL_STEP, SHOP_VIEW
+from fonts import draw_text, render_text
+from surfaces import to_display_format
 from save_system import save_system
+from runhistory import run_history, LEADERBOARD_SIZE
 # Pre-generate star positions once to avoid reseeding random each frame
 import random
-import math
 
 # Menu states
 MENU_STATE = "MENU"
 GAME_STATE = "GAME"
 GAME_OVER_STATE = "GAME_OVER"
 SHOP_STATE = "SHOP"
+LEADERBOARD_STATE = "LEADERBOARD"
 
 # Generate static star positions
 def generate_stars():
@@ -45,62 +51,96 @@ def generate_stars():
 # Generate stars once at module level
 STARS, BRIGHT_STARS = generate_stars()
 
-def draw_space_background(screen):
+# The stars never move, so the background is drawn once and then blitted
+background_cache = {"key": None, "surface": None}
+
+def render_space_background(screen_size):
+    surface = pygame.Surface(screen_size)
+    
     # Fill with a base dark space color
-    screen.fill((15, 10, 35))  # Dark purple-blue space color
+    surface.fill((15, 10, 35))  # Dark purple-blue space color
     
     # Draw pre-generated stars (no random calls) 
     for x, y, brightness, size in STARS:
         color = (brightness, brightness, brightness)
         if size == 1:
-            screen.set_at((x, y), color)
+            surface.set_at((x, y), color)
         else:
-            pygame.draw.circle(screen, color, (x, y), 1)
+            pygame.draw.circle(surface, color, (x, y), 1)
     
     # Draw bright stars
     for x, y in BRIGHT_STARS:
-        pygame.draw.circle(screen, (255, 255, 255), (x, y), 2)
+        pygame.draw.circle(surface, (255, 255, 255), (x, y), 2)
+    
+    return to_display_format(surface)
+
+def draw_space_background(screen):
+    # Rebuild when the screen size changes or the star lists are replaced
+    key = (screen.get_size(), id(STARS), id(BRIGHT_STARS))
+    if background_cache["key"] != key:
+        background_cache["surface"] = render_space_background(screen.get_size())
+        background_cache["key"] = key
+    screen.blit(background_cache["surface"], (0, 0))
+
+def invalidate_space_background():
+    """Force a redraw next frame (call after editing STARS in place)"""
+    background_cache["key"] = None
+
+# Pixel pattern for a heart (11x10 grid)
+HEART_PATTERN = [
+    [0,0,1,1,0,0,0,1,1,0,0],
+    [0,1,1,1,1,0,1,1,1,1,0],
+    [1,1,1,1,1,1,1,1,1,1,1],
+    [1,1,1,1,1,1,1,1,1,1,1],
+    [1,1,1,1,1,1,1,1,1,1,1],
+    [0,1,1,1,1,1,1,1,1,1,0],
+    [0,0,1,1,1,1,1,1,1,0,0],
+    [0,0,0,1,1,1,1,1,0,0,0],
+    [0,0,0,0,1,1,1,0,0,0,0],
+    [0,0,0,0,0,1,0,0,0,0,0],
+]
+
+# One heart per pixel size, plus the last lives strip built from it
+heart_sprites = {}
+hearts_cache = {"key": None, "surface": None}
+
+def render_heart(pixel_size):
+    """The heart pattern rasterized once at the given pixel scale"""
+    sprite = heart_sprites.get(pixel_size)
+    if sprite is None:
+        width = len(HEART_PATTERN[0]) * pixel_size
+        height = len(HEART_PATTERN) * pixel_size
+        sprite = pygame.Surface((width, height), pygame.SRCALPHA)
+        for row, pixels in enumerate(HEART_PATTERN):
+            for col, lit in enumerate(pixels):
+                if lit:
+                    sprite.fill("red", (col * pixel_size, row * pixel_size, pixel_size, pixel_size))
+        heart_sprites[pixel_size] = sprite
+    return sprite
+
+def render_hearts_strip(lives, pixel_size, heart_spacing):
+    heart = render_heart(pixel_size)
+    lives = min(lives, SCREEN_WIDTH // heart_spacing + 1)  # The rest would be off screen
+    width = (lives - 1) * heart_spacing + heart.get_width() if lives > 0 else 1
+    strip = pygame.Surface((width, heart.get_height()), pygame.SRCALPHA)
+    strip.blits([(heart, (i * heart_spacing, 0)) for i in range(lives)], doreturn=False)
+    return strip
 
 def draw_hearts(screen, lives):
     heart_spacing = 40
     start_x = 20
     start_y = 20
     pixel_size = 2  # Size of each "pixel" in the heart
-    
-    # Define the pixel pattern for a heart (13x11 grid)
-    heart_pattern = [
-        [0,0,1,1,0,0,0,1,1,0,0],
-        [0,1,1,1,1,0,1,1,1,1,0],
-        [1,1,1,1,1,1,1,1,1,1,1],
-        [1,1,1,1,1,1,1,1,1,1,1],
-        [1,1,1,1,1,1,1,1,1,1,1],
-        [0,1,1,1,1,1,1,1,1,1,0],
-        [0,0,1,1,1,1,1,1,1,0,0],
-        [0,0,0,1,1,1,1,1,0,0,0],
-        [0,0,0,0,1,1,1,0,0,0,0],
-        [0,0,0,0,0,1,0,0,0,0,0],
-    ]
-    
-    for i in range(lives):
-        heart_x = start_x + i * heart_spacing
-        heart_y = start_y
-        
-        # Draw each pixel of the heart
-        for row in range(len(heart_pattern)):
-            for col in range(len(heart_pattern[row])):
-                if heart_pattern[row][col] == 1:
-                    pixel_x = heart_x + col * pixel_size
-                    pixel_y = heart_y + row * pixel_size
-                    pygame.draw.rect(screen, "red", (pixel_x, pixel_y, pixel_size, pixel_size))
+
+    # Only re-composite the strip when the number of lives changes
+    key = (lives, pixel_size, heart_spacing)
+    if hearts_cache["key"] != key:
+        hearts_cache["surface"] = render_hearts_strip(lives, pixel_size, heart_spacing)
+        hearts_cache["key"] = key
+    screen.blit(hearts_cache["surface"], (start_x, start_y))
 
 def draw_timer(screen, game_time, current_level, asteroids_killed):
-    # Convert game_time (in seconds) to minutes:seconds:milliseconds format
-    minutes = int(game_time // 60)
-    seconds = int(game_time % 60)
-    milliseconds = int((game_time % 1) * 100)
-    
-    # Format the time string
-    time_str = f"{minutes:02d}:{seconds:02d}:{milliseconds:02d}"
+    time_str = format_time(game_time)
     
     # Calculate asteroids needed for next level
     if current_level < MAX_LEVEL:
@@ -110,29 +150,14 @@ def draw_timer(screen, game_time, current_level, asteroids_killed):
     else:
         progress_str = "MAX LEVEL!"
     
-    # Create fonts
-    time_font = pygame.font.Font(None, 36)
-    progress_font = pygame.font.Font(None, 28)
-    
-    # Render text surfaces
-    time_surface = time_font.render(time_str, True, (255, 255, 255))
-    progress_surface = progress_font.render(progress_str, True, (200, 200, 255))
-    
-    # Position in top-right corner
-    time_rect = time_surface.get_rect()
-    time_rect.topright = (SCREEN_WIDTH - 20, 20)
-    
-    progress_rect = progress_surface.get_rect()
-    progress_rect.topright = (SCREEN_WIDTH - 20, 55)
-    
-    screen.blit(time_surface, time_rect)
-    screen.blit(progress_surface, progress_rect)
+    # Position in top-right corner (both change constantly, so they are
+    # rendered fresh rather than cached)
+    draw_text(screen, time_str, 36, (255, 255, 255), (SCREEN_WIDTH - 20, 20), "topright")
+    draw_text(screen, progress_str, 28, (200, 200, 255), (SCREEN_WIDTH - 20, 55), "topright")
 
 def draw_level(screen, level):
-    # Create font for the level display
-    font = pygame.font.Font(None, 48)
     level_text = f"Level {level}"
-    text_surface = font.render(level_text, True, (255, 255, 255))
+    text_surface = render_text(level_text, 48, (255, 255, 255))
     
     # Position in top-center of screen
     text_rect = text_surface.get_rect()
@@ -146,7 +171,7 @@ class Button:
     def __init__(self, x, y, width, height, text, font_size=36):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
-        self.font = pygame.font.Font(None, font_size)
+        self.font_size = font_size
         self.is_hovered = False
         
     def draw(self, screen):
@@ -163,7 +188,7 @@ class Button:
         pygame.draw.rect(screen, (255, 255, 255), self.rect, 3)  # White border
         
         # Draw button text
-        text_surface = self.font.render(self.text, True, text_color)
+        text_surface = render_text(self.text, self.font_size, text_color)
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
     
@@ -183,16 +208,14 @@ def draw_menu(screen, buttons):
     draw_coins(screen, save_system.get_coins())
     
     # Draw game title
-    title_font = pygame.font.Font(None, 72)
     title_text = "Asteroids Game!"
-    title_surface = title_font.render(title_text, True, (255, 255, 255))
+    title_surface = render_text(title_text, 72, (255, 255, 255))
     title_rect = title_surface.get_rect(center=(SCREEN_WIDTH // 2, 150))
     screen.blit(title_surface, title_rect)
     
     # Draw subtitle
-    subtitle_font = pygame.font.Font(None, 24)
     subtitle_text = "Survive 1000 levels of asteroid mayhem!"
-    subtitle_surface = subtitle_font.render(subtitle_text, True, (200, 200, 255))
+    subtitle_surface = render_text(subtitle_text, 24, (200, 200, 255))
     subtitle_rect = subtitle_surface.get_rect(center=(SCREEN_WIDTH // 2, 200))
     screen.blit(subtitle_surface, subtitle_rect)
     
@@ -201,9 +224,8 @@ def draw_menu(screen, buttons):
         button.draw(screen)
     
     # Draw GitHub link at bottom center (clickable)
-    link_font = pygame.font.Font(None, 20)
     link_text = "https://github.com/MrPandayx/"
-    link_surface = link_font.render(link_text, True, (150, 150, 255))
+    link_surface = render_text(link_text, 20, (150, 150, 255))
     link_rect = link_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 30))
     screen.blit(link_surface, link_rect)
     
@@ -218,28 +240,21 @@ def draw_game_over_screen(screen, level, time, buttons, coins_earned=0):
     draw_coins(screen, save_system.get_coins())
     
     # Draw game over title
-    title_font = pygame.font.Font(None, 72)
     title_text = "GAME OVER"
-    title_surface = title_font.render(title_text, True, (255, 100, 100))
+    title_surface = render_text(title_text, 72, (255, 100, 100))
     title_rect = title_surface.get_rect(center=(SCREEN_WIDTH // 2, 150))
     screen.blit(title_surface, title_rect)
     
     # Draw stats
-    stats_font = pygame.font.Font(None, 36)
-    
-    # Format time
-    minutes = int(time // 60)
-    seconds = int(time % 60)
-    milliseconds = int((time % 1) * 100)
-    time_str = f"{minutes:02d}:{seconds:02d}:{milliseconds:02d}"
+    time_str = format_time(time)
     
     level_text = f"Level Reached: {level}"
     time_text = f"Survival Time: {time_str}"
     coins_text = f"Coins Earned: {coins_earned}"
     
-    level_surface = stats_font.render(level_text, True, (255, 255, 255))
-    time_surface = stats_font.render(time_text, True, (255, 255, 255))
-    coins_surface = stats_font.render(coins_text, True, (255, 215, 0))
+    level_surface = render_text(level_text, 36, (255, 255, 255))
+    time_surface = render_text(time_text, 36, (255, 255, 255))
+    coins_surface = render_text(coins_text, 36, (255, 215, 0))
     
     level_rect = level_surface.get_rect(center=(SCREEN_WIDTH // 2, 220))
     time_rect = time_surface.get_rect(center=(SCREEN_WIDTH // 2, 260))
@@ -253,10 +268,97 @@ def draw_game_over_screen(screen, level, time, buttons, coins_earned=0):
     for button in buttons:
         button.draw(screen)
 
+# Leaderboard table columns: heading and centre x
+LEADERBOARD_COLUMNS = [("#", 300), ("LEVEL", 440), ("TIME", 600), ("COINS", 760), ("PLAYER", 940)]
+
+def run_player(run):
+    return "You" if run["source"] == "player" else run["source"]
+
+def load_leaderboard(history):
+    """Everything the leaderboard screen shows, queried once when it opens"""
+    return {
+        "top": history.top_runs(LEADERBOARD_SIZE),
+        "best_level": history.personal_best(by="level"),
+        "best_time": history.personal_best(by="time"),
+        "runs": history.count(),
+    }
+
+def draw_leaderboard(screen, buttons, leaderboard):
+    """Draw the top runs and the player's personal bests"""
+    # Draw space background
+    draw_space_background(screen)
+    
+    # Draw leaderboard title
+    title_surface = render_text("LEADERBOARD", 72, (255, 215, 0))
+    screen.blit(title_surface, title_surface.get_rect(center=(SCREEN_WIDTH // 2, 80)))
+    
+    # Draw coin display
+    draw_coins(screen, save_system.get_coins())
+    
+    # Draw the table of top runs (best level first, longest survival breaks ties)
+    for heading, x in LEADERBOARD_COLUMNS:
+        heading_surface = render_text(heading, 28, (200, 200, 255))
+        screen.blit(heading_surface, heading_surface.get_rect(center=(x, 150)))
+    for rank, run in enumerate(leaderboard["top"], 1):
+        color = (255, 255, 255) if run["source"] == "player" else (170, 170, 170)
+        cells = [str(rank), str(run["level"]), format_time(run["survival_time"]), str(run["coins"]), run_player(run)]
+        for text, (_, x) in zip(cells, LEADERBOARD_COLUMNS):
+            cell_surface = render_text(text, 28, color)
+            screen.blit(cell_surface, cell_surface.get_rect(center=(x, 155 + rank * 34)))
+    if not leaderboard["top"]:
+        empty_surface = render_text("No runs yet - go play!", 36, (255, 255, 255))
+        screen.blit(empty_surface, empty_surface.get_rect(center=(SCREEN_WIDTH // 2, 300)))
+    
+    # Draw personal bests
+    best_level, best_time = leaderboard["best_level"], leaderboard["best_time"]
+    if best_level is not None:
+        best_lines = [
+            f"Personal Best: Level {best_level['level']} ({format_time(best_level['survival_time'])})",
+            f"Longest Survival: {format_time(best_time['survival_time'])} (Level {best_time['level']})",
+        ]
+    else:
+        best_lines = ["Personal Best: none yet"]
+    for i, text in enumerate(best_lines):
+        best_surface = render_text(text, 32, (100, 255, 100))
+        screen.blit(best_surface, best_surface.get_rect(center=(SCREEN_WIDTH // 2, 560 + i * 40)))
+    
+    runs_surface = render_text(f"{leaderboard['runs']} runs recorded", 20, (150, 150, 150))
+    screen.blit(runs_surface, runs_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 40)))
+    
+    # Draw navigation buttons
+    for button in buttons:
+        button.draw(screen)
+
+# Screen areas the menus redraw when their contents change
+COINS_RECT = pygame.Rect(SCREEN_WIDTH - 140, SCREEN_HEIGHT - 60, 140, 45)
+
+def button_regions(buttons):
+    """Compositor regions for a row of buttons (redrawn on hover changes)"""
+    return {f"button {button.text}": (button.rect, button.is_hovered) for button in buttons}
+
+async def wait_for_events(timeout_ms):
+    """Yield to the browser until input arrives (or timeout_ms passes).
+    pygame.event.wait would block the page, so this polls instead."""
+    deadline = pygame.time.get_ticks() + timeout_ms
+    events = pygame.event.get()
+    while not events and pygame.time.get_ticks() < deadline:
+        await asyncio.sleep(IDLE_POLL_INTERVAL)
+        events = pygame.event.get()
+    return events
+
+def coalesce_motion(events):
+    """Drop mouse motion that is immediately followed by more motion;
+    only the latest pointer position matters for hover states"""
+    last = len(events) - 1
+    return [event for i, event in enumerate(events)
+            if event.type != pygame.MOUSEMOTION or i == last or events[i + 1].type != pygame.MOUSEMOTION]
+
+def draw_paused(screen):
+    paused_surface = render_text("PAUSED", 72, (255, 255, 255))
+    screen.blit(paused_surface, paused_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)))
+
 def draw_coins(screen, coins):
     """Draw coin display in bottom right corner"""
-    font = pygame.font.Font(None, 36)
-    
     # Draw coin icon (simple circle)
     coin_radius = 15
     coin_x = SCREEN_WIDTH - 120
@@ -269,118 +371,25 @@ def draw_coins(screen, coins):
     
     # Draw coin count
     coin_text = f"{coins}"
-    coin_surface = font.render(coin_text, True, (255, 255, 255))
+    coin_surface = render_text(coin_text, 36, (255, 255, 255))
     screen.blit(coin_surface, (coin_x + 25, coin_y - 15))
 
-def draw_shop(screen, buttons, shop_items, scroll_offset=0):
+def draw_shop(screen, buttons, catalog):
     """Draw the shop interface"""
     # Draw space background
     draw_space_background(screen)
     
     # Draw shop title
-    title_font = pygame.font.Font(None, 72)
     title_text = "SHIP SKINS SHOP"
-    title_surface = title_font.render(title_text, True, (255, 215, 0))
+    title_surface = render_text(title_text, 72, (255, 215, 0))
     title_rect = title_surface.get_rect(center=(SCREEN_WIDTH // 2, 80))
     screen.blit(title_surface, title_rect)
     
     # Draw coin display
     draw_coins(screen, save_system.get_coins())
     
-    # Draw shop items
-    items_per_row = 3
-    item_width = 200
-    item_height = 120
-    start_x = (SCREEN_WIDTH - (items_per_row * item_width + (items_per_row - 1) * 20)) // 2
-    start_y = 150 + scroll_offset
-    
-    owned_skins = save_system.get_owned_skins()
-    current_skin = save_system.get_current_skin()
-    
-    for i, (skin_id, skin_data) in enumerate(PLAYER_SKINS.items()):
-        row = i // items_per_row
-        col = i % items_per_row
-        
-        x = start_x + col * (item_width + 20)
-        y = start_y + row * (item_height + 30)
-        
-        # Skip if off screen
-        if y < -item_height or y > SCREEN_HEIGHT:
-            continue
-        
-        # Draw item background
-        is_owned = skin_id in owned_skins
-        is_current = skin_id == current_skin
-        
-        if is_current:
-            bg_color = (50, 150, 50)  # Green for current
-            border_color = (100, 255, 100)
-        elif is_owned:
-            bg_color = (50, 50, 150)  # Blue for owned
-            border_color = (100, 100, 255)
-        else:
-            bg_color = (50, 50, 50)   # Gray for not owned
-            border_color = (150, 150, 150)
-        
-        item_rect = pygame.Rect(x, y, item_width, item_height)
-        pygame.draw.rect(screen, bg_color, item_rect)
-        pygame.draw.rect(screen, border_color, item_rect, 3)
-        
-        # Draw preview triangle
-        preview_center = (x + item_width // 2, y + 35)
-        preview_radius = 15
-        
-        # Create triangle points
-        triangle_points = []
-        for angle in [0, 120, 240]:  # Triangle vertices
-            angle_rad = math.radians(angle)
-            point_x = preview_center[0] + preview_radius * math.cos(angle_rad)
-            point_y = preview_center[1] + preview_radius * math.sin(angle_rad)
-            triangle_points.append((point_x, point_y))
-        
-        # Get color for preview
-        if skin_id == "rainbow":
-            # Simple rainbow effect for preview
-            time_offset = i * 0.5
-            r = int(127 + 127 * math.sin(time_offset))
-            g = int(127 + 127 * math.sin(time_offset + 2.09))
-            b = int(127 + 127 * math.sin(time_offset + 4.18))
-            preview_color = (r, g, b)
-        else:
-            preview_color = skin_data["color"]
-        
-        pygame.draw.polygon(screen, preview_color, triangle_points, 2)
-        
-        # Draw skin name
-        name_font = pygame.font.Font(None, 24)
-        name_surface = name_font.render(skin_data["name"], True, (255, 255, 255))
-        name_rect = name_surface.get_rect(center=(x + item_width // 2, y + 70))
-        screen.blit(name_surface, name_rect)
-        
-        # Draw price/status
-        status_font = pygame.font.Font(None, 20)
-        if is_current:
-            status_text = "EQUIPPED"
-            status_color = (100, 255, 100)
-        elif is_owned:
-            status_text = "OWNED"
-            status_color = (100, 150, 255)
-        else:
-            status_text = f"{skin_data['price']} coins"
-            status_color = (255, 215, 0)
-        
-        status_surface = status_font.render(status_text, True, status_color)
-        status_rect = status_surface.get_rect(center=(x + item_width // 2, y + 95))
-        screen.blit(status_surface, status_rect)
-        
-        # Store item rect for clicking
-        shop_items.append({
-            "rect": item_rect,
-            "skin_id": skin_id,
-            "skin_data": skin_data,
-            "is_owned": is_owned,
-            "is_current": is_current
-        })
+    # Draw the visible rows of shop items (animated previews follow the clock)
+    catalog.draw(screen, pygame.time.get_ticks() / 1000)
     
     # Draw navigation buttons
     for button in buttons:
@@ -440,8 +449,9 @@ async def main():
     try:
         play_button = Button(button_x, 280, button_width, button_height, "PLAY")
         shop_button = Button(button_x, 360, button_width, button_height, "SHOP") 
-        quit_button = Button(button_x, 440, button_width, button_height, "QUIT")
-        menu_buttons = [play_button, shop_button, quit_button]
+        scores_button = Button(button_x, 440, button_width, button_height, "SCORES")
+        quit_button = Button(button_x, 520, button_width, button_height, "QUIT")
+        menu_buttons = [play_button, shop_button, scores_button, quit_button]
         print(f"Created {len(menu_buttons)} menu buttons successfully!")
     except Exception as e:
         print(f"Error creating buttons: {e}")
@@ -450,6 +460,11 @@ async def main():
     # Create shop buttons
     back_button = Button(50, SCREEN_HEIGHT - 80, 120, 50, "BACK")
     shop_buttons = [back_button]
+    catalog = SkinCatalog()  # Shop tiles, rendered once and scrolled
+    
+    # Create leaderboard buttons
+    leaderboard_buttons = [back_button]
+    leaderboard = None  # Queried from the run history when the screen opens
     
     # Create game over buttons
     play_again_button = Button(button_x, 350, button_width, button_height, "PLAY AGAIN")
@@ -458,24 +473,19 @@ async def main():
     
     # Game variables (will be reset when starting new game)
     dt = 0
-    game_time = 0
-    current_level = 1
-    asteroids_killed = 0
+    accumulator = 0.0  # Simulation time owed to the fixed-step loop
     final_level = 1
     final_time = 0
     coins_earned_this_game = 0
-    starting_level = 1
     github_link_rect = None  # Store the GitHub link rect for click detection
-    
-    # Game objects (will be created when starting new game)
-    updatable = None
-    drawable = None
-    asteroids = None
-    shots = None
-    shakes = None
-    player = None
-    asteroid_field = None
-    shake_field = None
+    session = None  # GameSession (created when starting new game)
+    profiler = FrameProfiler()  # F3: timing overlay, F4: cProfile capture
+    compositor = Compositor()  # Partial redraws for the menu, shop and game over screens
+    focused = True  # Window state; the game suspends unless focused and visible
+    visible = True
+    suspended = False
+    repaint = False  # The window needs repainting even while suspended
+    last_suspended_draw = 0  # Ticks of the last repaint while suspended
     
     print("Starting main game loop...")
     frame_count = 0
@@ -484,10 +494,52 @@ async def main():
         if frame_count % 60 == 0:  # Log every second
             print(f"Game running... Frame {frame_count}, State: {current_state}")
             
-        for event in pygame.event.get():
+        profiler.begin_frame()
+        if suspended:
+            # Minimized or in the background: wake rarely, and only to redraw
+            events = await wait_for_events(SUSPENDED_WAIT_MS)
+            clock.tick()
+            profiler.lap("idle")
+        elif current_state != GAME_STATE and profiler.capture is None:
+            # Nothing moves on this screen: sleep until there is input.
+            # Animated previews only need a few redraws a second.
+            timeout = ANIMATED_WAIT_MS if compositor.animating else IDLE_WAIT_MS
+            events = await wait_for_events(timeout)
+            clock.tick()  # Don't count the time asleep as frame time
+            profiler.lap("idle")
+        else:
+            events = pygame.event.get()
+        
+        for event in coalesce_motion(events):
             if event.type == pygame.QUIT:
+                profiler.print_activity()
                 return
             
+            # Track whether anyone can see or is using the window
+            if event.type in (pygame.WINDOWFOCUSLOST, pygame.WINDOWFOCUSGAINED):
+                focused = event.type == pygame.WINDOWFOCUSGAINED
+            elif event.type in (pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN):
+                visible = False
+            elif event.type in (pygame.WINDOWRESTORED, pygame.WINDOWMAXIMIZED, pygame.WINDOWSHOWN):
+                visible = True
+            
+            # Closing the tab never returns from main(), so write any
+            # debounced save change as soon as the page goes out of use
+            if event.type in (pygame.WINDOWFOCUSLOST, pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN):
+                save_system.flush_pending()
+            
+            # The window contents may have been lost, so repaint everything
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+                compositor.invalidate()
+                repaint = True
+            
+            # Debug hotkeys work on every screen
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    profiler.toggle_overlay()
+                elif event.key == pygame.K_F4:
+                    profiler.start_capture(PROFILE_CAPTURE_FRAMES)
+            
             # Handle menu events
             if current_state == MENU_STATE:
                 # Handle GitHub link clicks
@@ -503,91 +555,53 @@ async def main():
                             # Start new game
                             current_state = GAME_STATE
                             
-                            # Reset game variables
-                            dt = 0
-                            game_time = 0
-                            current_level = 1
-                            asteroids_killed = 0
-                            coins_earned_this_game = 0
-                            starting_level = current_level
-                            
-                            # Create groups
-                            updatable = pygame.sprite.Group()
-                            drawable = pygame.sprite.Group()
-                            asteroids = pygame.sprite.Group()
-                            shots = pygame.sprite.Group()
-                            shakes = pygame.sprite.Group()
-                            
-                            # Set containers for all classes
-                            Player.containers = (updatable, drawable)
-                            Asteroid.containers = (asteroids, updatable, drawable)
-                            AsteroidField.containers = (updatable,)
-                            Shot.containers = (shots, updatable, drawable)
-                            Shake.containers = (shakes, updatable, drawable)
-                            ShakeField.containers = (updatable,)
-                            
-                            # Create game objects
-                            x = SCREEN_WIDTH / 2
-                            y = SCREEN_HEIGHT / 2
-                            player = Player(x, y)
-                            # Update player skin from save system
-                            player.update_skin()
-                            asteroid_field = AsteroidField()
-                            shake_field = ShakeField()
+                            session = GameSession()
+                            accumulator = 0.0
                             
                         elif button == shop_button:
                             current_state = SHOP_STATE
                             
+                        elif button == scores_button:
+                            leaderboard = load_leaderboard(run_history)
+                            current_state = LEADERBOARD_STATE
+                            
                         elif button == quit_button:
+                            profiler.print_activity()
                             return
             
             # Handle shop events
             elif current_state == SHOP_STATE:
-                shop_items = []  # Reset shop items list
-                
                 for button in shop_buttons:
                     if button.handle_event(event):
                         if button == back_button:
                             current_state = MENU_STATE
                 
+                if event.type == pygame.MOUSEWHEEL:
+                    catalog.scroll_by(-event.y * SCROLL_STEP)
+                
                 # Handle shop item clicks
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    mouse_pos = event.pos
-                    
-                    # Check shop items (we need to recreate the layout)
-                    items_per_row = 3
-                    item_width = 200
-                    item_height = 120
-                    start_x = (SCREEN_WIDTH - (items_per_row * item_width + (items_per_row - 1) * 20)) // 2
-                    start_y = 150
-                    
-                    for i, (skin_id, skin_data) in enumerate(PLAYER_SKINS.items()):
-                        row = i // items_per_row
-                        col = i % items_per_row
-                        
-                        x = start_x + col * (item_width + 20)
-                        y = start_y + row * (item_height + 30)
-                        
-                        item_rect = pygame.Rect(x, y, item_width, item_height)
-                        
-                        if item_rect.collidepoint(mouse_pos):
-                            owned_skins = save_system.get_owned_skins()
-                            current_skin = save_system.get_current_skin()
-                            
-                            if skin_id == current_skin:
-                                continue  # Already equipped
-                            elif skin_id in owned_skins:
-                                # Equip this skin
+                    skin_id = catalog.skin_at(event.pos)
+                    if skin_id is not None and skin_id != save_system.get_current_skin():
+                        skin_data = PLAYER_SKINS[skin_id]
+                        if skin_id in save_system.get_owned_skins():
+                            # Equip this skin
+                            save_system.set_current_skin(skin_id)
+                            print(f"Equipped {skin_data['name']}")
+                        else:
+                            # Try to buy this skin
+                            if save_system.buy_skin(skin_id):
                                 save_system.set_current_skin(skin_id)
-                                print(f"Equipped {skin_data['name']}")
+                                print(f"Bought and equipped {skin_data['name']} for {skin_data['price']} coins!")
                             else:
-                                # Try to buy this skin
-                                if save_system.buy_skin(skin_id):
-                                    save_system.set_current_skin(skin_id)
-                                    print(f"Bought and equipped {skin_data['name']} for {skin_data['price']} coins!")
-                                else:
-                                    print(f"Not enough coins! Need {skin_data['price']} coins for {skin_data['name']}")
-                            break
+                                print(f"Not enough coins! Need {skin_data['price']} coins for {skin_data['name']}")
+            
+            # Handle leaderboard events
+            elif current_state == LEADERBOARD_STATE:
+                for button in leaderboard_buttons:
+                    if button.handle_event(event):
+                        if button == back_button:
+                            current_state = MENU_STATE
             
             # Handle game over events
             elif current_state == GAME_OVER_STATE:
@@ -597,126 +611,115 @@ async def main():
                             # Start new game
                             current_state = GAME_STATE
                             
-                            # Reset game variables
-                            dt = 0
-                            game_time = 0
-                            current_level = 1
-                            asteroids_killed = 0
-                            coins_earned_this_game = 0
-                            starting_level = current_level
-                            
-                            # Create groups
-                            updatable = pygame.sprite.Group()
-                            drawable = pygame.sprite.Group()
-                            asteroids = pygame.sprite.Group()
-                            shots = pygame.sprite.Group()
-                            shakes = pygame.sprite.Group()
-                            
-                            # Set containers for all classes
-                            Player.containers = (updatable, drawable)
-                            Asteroid.containers = (asteroids, updatable, drawable)
-                            AsteroidField.containers = (updatable,)
-                            Shot.containers = (shots, updatable, drawable)
-                            Shake.containers = (shakes, updatable, drawable)
-                            ShakeField.containers = (updatable,)
-                            
-                            # Create game objects
-                            x = SCREEN_WIDTH / 2
-                            y = SCREEN_HEIGHT / 2
-                            player = Player(x, y)
-                            # Update player skin from save system
-                            player.update_skin()
-                            asteroid_field = AsteroidField()
-                            shake_field = ShakeField()
+                            session = GameSession()
+                            accumulator = 0.0
                             
                         elif button == main_menu_button:
                             current_state = MENU_STATE
         
-        # Game logic
+        profiler.lap("events")
+        
+        was_suspended = suspended
+        suspended = not (focused and visible)
+        profiler.set_suspended(suspended)
+        
+        # While suspended nothing moves, so input waking the loop is no
+        # reason to draw: repaint only to show PAUSED, when the window is
+        # uncovered, or at most once every SUSPENDED_WAIT_MS
+        if suspended:
+            now = pygame.time.get_ticks()
+            if (was_suspended and not repaint
+                    and now - last_suspended_draw < SUSPENDED_WAIT_MS):
+                profiler.end_frame()
+                dt = clock.tick(MAX_RENDER_FPS) / 1000
+                await asyncio.sleep(0)
+                continue
+            last_suspended_draw = now
+        repaint = False
+        
+        # Game logic (paused while suspended, which also stops the game clock)
+        if current_state == GAME_STATE and not suspended:
+            # Run as many fixed steps as the real time that passed calls for,
+            # capped so one slow frame can't snowball into a longer one
+            accumulator += dt
+            steps = 0
+            while accumulator >= FIXED_DT and steps < MAX_CATCH_UP_STEPS:
+                session.step(FIXED_DT, profiler)
+                accumulator -= FIXED_DT
+                steps += 1
+                if session.game_over:
+                    final_level = session.current_level
+                    final_time = session.game_time
+                    coins_earned_this_game = session.coins_earned
+                    current_state = GAME_OVER_STATE
+                    break
+            if steps == MAX_CATCH_UP_STEPS:
+                accumulator = min(accumulator, FIXED_DT)  # Drop the backlog
+        
+        # Rendering
+        overlay_lines = ()
         if current_state == GAME_STATE:
-            # Update all updatable objects
-            updatable.update(dt)
+            draw_space_background(screen)  # Draw the space background
+            profiler.lap("background")
+            
+            # Draw all game objects between the last two steps
+            session.draw(screen, accumulator / FIXED_DT)
+            profiler.lap("sprites")
             
-            # Update game time
-            game_time += dt
+            draw_hearts(screen, session.player.lives)  # Draw the player's lives as hearts
+            draw_coins(screen, save_system.get_coins())  # Draw coin display
+            draw_timer(screen, session.game_time, session.current_level, session.asteroids_killed)  # Draw the timer and progress
+            draw_level(screen, session.current_level)  # Draw the current level
+            if suspended:
+                draw_paused(screen)
+            overlay_lines = session.entity_counts()
+            profiler.draw(screen, overlay_lines)
+            profiler.lap("hud")
             
-            # Update level based on asteroid kills
-            asteroids_needed_for_next = get_asteroids_needed_for_level(current_level + 1)
-            if asteroids_killed >= asteroids_needed_for_next and current_level < MAX_LEVEL:
-                current_level += 1
+            pygame.display.flip()
+            profiler.lap("flip")
+            compositor.invalidate()  # The game drew over everything the compositor knows about
+        else:
+            # The other screens are mostly static: describe what is on them
+            # and let the compositor redraw only the parts that changed
+            if current_state == MENU_STATE:
+                regions = button_regions(menu_buttons)
                 
-                # Award coin for reaching new level
-                save_system.add_coins(COINS_PER_LEVEL)
-                coins_earned_this_game += COINS_PER_LEVEL
+                def draw_scene(surface):
+                    nonlocal github_link_rect
+                    github_link_rect = draw_menu(surface, menu_buttons)
+            elif current_state == SHOP_STATE:
+                regions = button_regions(shop_buttons)
+                regions["items"] = (SHOP_VIEW, catalog.state())
+                regions.update(catalog.animated_regions())
                 
-                asteroid_field.set_level(current_level)
-                print(f"Level up! Now at level {current_level} (killed {asteroids_killed} asteroids) - Earned {COINS_PER_LEVEL} coin!")
-            
-            # Check for collisions between player and asteroids
-            for asteroid in asteroids:
-                if player.collides_with(asteroid):
-                    if player.take_damage():
-                        # Game over - save final stats
-                        final_level = current_level
-                        final_time = game_time
-                        current_state = GAME_OVER_STATE
-                        
-                        # Award coins for levels completed (if any)
-                        levels_completed = current_level - starting_level
-                        if levels_completed > 0:
-                            bonus_coins = levels_completed * COINS_PER_LEVEL
-                            save_system.add_coins(bonus_coins)
-                            coins_earned_this_game += bonus_coins
-                        
-                        # Format the final time for display
-                        minutes = int(game_time // 60)
-                        seconds = int(game_time % 60)
-                        milliseconds = int((game_time % 1) * 100)
-                        time_str = f"{minutes:02d}:{seconds:02d}:{milliseconds:02d}"
-                        print(f"Game over! You reached level {current_level} and survived for {time_str}")
-                        print(f"Total coins earned this game: {coins_earned_this_game}")
-                    else:
-                        print(f"Hit! {player.lives} hearts remaining")
-                    asteroid.kill()  # Remove the asteroid that hit the player
-            
-            # Check for collisions between player and shakes
-            for shake in shakes:
-                if player.collides_with(shake):
-                    player.activate_shake_effect()
-                    shake.kill()
-                    print("Shake power-up collected! No shooting delay for 5 seconds!")
-            
-            # Check for collisions between shots and asteroids
-            for asteroid in asteroids:
-                for shot in shots:
-                    if asteroid.collides_with(shot):
-                        shot.kill()
-                        asteroid.kill()
-                        asteroids_killed += 1  # Count the kill
-        
-        # Rendering
-        if current_state == MENU_STATE:
-            github_link_rect = draw_menu(screen, menu_buttons)
-        elif current_state == SHOP_STATE:
-            shop_items = []
-            draw_shop(screen, shop_buttons, shop_items)
-        elif current_state == GAME_STATE:
-            draw_space_background(screen)  # Draw the space background
+                def draw_scene(surface):
+                    draw_shop(surface, shop_buttons, catalog)
+            elif current_state == LEADERBOARD_STATE:
+                regions = button_regions(leaderboard_buttons)
+                
+                def draw_scene(surface):
+                    draw_leaderboard(surface, leaderboard_buttons, leaderboard)
+            else:
+                regions = button_regions(game_over_buttons)
+                
+                def draw_scene(surface):
+                    draw_game_over_screen(surface, final_level, final_time, game_over_buttons, coins_earned_this_game)
+            regions["coins"] = (COINS_RECT, save_system.get_coins())
+            if profiler.visible:
+                overlay_lines = (f"compositor redraws {compositor.redraws}",)
+                regions["profiler"] = (profiler.panel_rect, None)  # Changes every frame
             
-            # Draw all drawable objects
-            for sprite in drawable:
-                sprite.draw(screen)
+            def draw_frame(surface):
+                draw_scene(surface)
+                profiler.draw(surface, overlay_lines)
             
-            draw_hearts(screen, player.lives)  # Draw the player's lives as hearts
-            draw_coins(screen, save_system.get_coins())  # Draw coin display
-            draw_timer(screen, game_time, current_level, asteroids_killed)  # Draw the timer and progress
-            draw_level(screen, current_level)  # Draw the current level
-        elif current_state == GAME_OVER_STATE:
-            draw_game_over_screen(screen, final_level, final_time, game_over_buttons, coins_earned_this_game)
-        
-        pygame.display.flip()
-        dt = clock.tick(60) / 1000
+            compositor.present(screen, current_state, regions, draw_frame)
+            profiler.lap("present")
+        profiler.end_frame()
+        dt = clock.tick(MAX_RENDER_FPS) / 1000
         await asyncio.sleep(0)
 
 if __name__ == "__main__":
     asyncio.run(main())
+    save_system.close()  # Don't lose a change still waiting to be written
@@ -0,0 +1,36 @@
+# Pre-built, reusable StoredShape instances.
+# Each pooled instance owns its entity store slot for life; acquiring and
+# releasing only flips the slot's alive flag, so no sprites, vectors or
+# group memberships are created or torn down while playing.
+class Pool:
+    def __init__(self, factory, size):
+        self.factory = factory
+        self.free = []
+        self.created = 0
+        self.in_use = 0
+        self.high_water = 0  # Most instances ever in use at once
+        self.reserve(size)
+
+    def reserve(self, count):
+        """Build count more instances and park them in the free list"""
+        for _ in range(count):
+            instance = self.factory()
+            instance.pool = self
+            instance.store.deactivate(instance.slot)
+            self.free.append(instance)
+        self.created += count
+
+    def acquire(self, x, y, radius):
+        if not self.free:
+            self.reserve(self.created or 1)  # Double when exhausted
+        instance = self.free.pop()
+        instance.respawn(x, y, radius)
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return instance
+
+    def release(self, instance):
+        instance.store.deactivate(instance.slot)
+        self.free.append(instance)
+        self.in_use -= 1
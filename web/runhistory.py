@@ -0,0 +1,131 @@
+import atexit
+import queue
+import sys
+import threading
+import time
+
+try:
+    import sqlite3
+except ImportError:  # Not every Python build ships it (e.g. some browser builds)
+    sqlite3 = None
+
+# Every finished run, kept in a local SQLite database for the leaderboard.
+# Bots record their runs here too, so the table can hold hundreds of
+# thousands of rows: the leaderboard queries are all served from indexes
+# and the inserts happen on a background thread in batches.
+RUNS_FILE = "runs.db"
+LEADERBOARD_SIZE = 10
+THREADS_AVAILABLE = sys.platform != "emscripten"  # pygbag runs on one thread
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    ended_at REAL NOT NULL,
+    source TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    survival_time REAL NOT NULL,
+    coins INTEGER NOT NULL,
+    kills INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_level ON runs (level DESC, survival_time DESC);
+CREATE INDEX IF NOT EXISTS runs_by_time ON runs (survival_time DESC);
+CREATE INDEX IF NOT EXISTS runs_by_source_level ON runs (source, level DESC, survival_time DESC);
+CREATE INDEX IF NOT EXISTS runs_by_source_time ON runs (source, survival_time DESC);
+"""
+
+# How each leaderboard is ranked (each matches one of the indexes above)
+ORDERINGS = {
+    "level": "level DESC, survival_time DESC",
+    "time": "survival_time DESC",
+}
+COLUMNS = "ended_at, source, level, survival_time, coins, kills"
+
+
+def connect(path):
+    db = sqlite3.connect(path, timeout=5)
+    db.row_factory = sqlite3.Row
+    if path != ":memory:":
+        db.execute("PRAGMA journal_mode=WAL")  # Readers don't wait for the writer
+    db.executescript(SCHEMA)
+    return db
+
+
+def insert_runs(db, rows):
+    with db:
+        db.executemany(f"INSERT INTO runs ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+
+class RunHistory:
+    def __init__(self, path=RUNS_FILE, threaded=THREADS_AVAILABLE):
+        self.path = path
+        self.threaded = threaded and path != ":memory:"  # A :memory: db can't be shared
+        self.db = None  # Opened by the first query (or first record, without threads)
+        self.queue = queue.Queue()
+        self.thread = None
+
+    def database(self):
+        if self.db is None and sqlite3 is not None:
+            self.db = connect(self.path)
+        return self.db
+
+    def record(self, level, survival_time, coins, kills, source="player"):
+        """Store one finished run (in the background where threads exist)"""
+        if sqlite3 is None:
+            return
+        row = (time.time(), source, level, survival_time, coins, kills)
+        if not self.threaded:
+            insert_runs(self.database(), [row])
+            return
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="run-history", daemon=True)
+            self.thread.start()
+            atexit.register(self.close)
+        self.queue.put(row)
+
+    def run(self):
+        db = connect(self.path)  # SQLite connections belong to one thread
+        while True:
+            rows = [self.queue.get()]
+            # Take everything else already queued and insert it in one transaction
+            while True:
+                try:
+                    rows.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in rows
+            rows = [row for row in rows if row is not None]
+            if rows:
+                insert_runs(db, rows)
+            if stop:
+                db.close()
+                return
+
+    def close(self):
+        """Finish writing queued runs"""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def query(self, sql, params=()):
+        db = self.database()
+        if db is None:
+            return []
+        return db.execute(sql, params).fetchall()
+
+    def top_runs(self, limit=LEADERBOARD_SIZE, by="level"):
+        """The best `limit` runs overall, ranked by level or survival time"""
+        return self.query(f"SELECT {COLUMNS} FROM runs ORDER BY {ORDERINGS[by]} LIMIT ?", (limit,))
+
+    def personal_best(self, source="player", by="level"):
+        """The best run from one source (the player by default), or None"""
+        rows = self.query(f"SELECT {COLUMNS} FROM runs WHERE source = ? ORDER BY {ORDERINGS[by]} LIMIT 1", (source,))
+        return rows[0] if rows else None
+
+    def count(self):
+        rows = self.query("SELECT COUNT(*) FROM runs")
+        return rows[0][0] if rows else 0
+
+
+# Global run history instance
+run_history = RunHistory()
@@ -1,47 +1,117 @@
-import json
+import asyncio
+import platform
 from constants import STARTING_COINS
+from savedata import apply_record, decode, default_data, encode
 
-# Web version uses in-memory storage only
-class SaveSystem:
+# Web version keeps the save in the browser's localStorage, as the same
+# JSON document the desktop game writes to game_save.json
+STORAGE_KEY = "asteroids_save"
+SAVE_DEBOUNCE = 1.0  # Seconds to collect changes before writing them
+
+class MemoryStorage:
+    """In-memory stand-in for window.localStorage (local runs and tests)"""
     def __init__(self):
-        # For web version, start with default data (no file I/O)
-        self.data = self.get_default_data()
+        self.items = {}
+
+    def getItem(self, key):
+        return self.items.get(key)
+
+    def setItem(self, key, value):
+        self.items[key] = value
+
+def browser_storage():
+    """window.localStorage through pygbag's platform bridge, or a
+    MemoryStorage when not running in a browser"""
+    window = getattr(platform, "window", None)
+    if window is not None:
+        try:
+            return window.localStorage
+        except Exception as e:
+            print(f"localStorage unavailable: {e}")
+    print("Not running in a browser, saves are kept in memory only")
+    return MemoryStorage()
+
+class SaveSystem:
+    def __init__(self, path=STORAGE_KEY, storage=None):
+        # path is the localStorage key, as on desktop it is the save file;
+        # path=None keeps everything in memory (headless runs use this).
+        # storage defaults to the browser's localStorage.
+        self.path = path
+        if path is None:
+            storage = MemoryStorage()
+        self.storage = storage if storage is not None else browser_storage()
+        self.data = self.load_data()
+        self.flush_handle = None  # Pending debounced write
+        self.writes = 0
         print("SaveSystem initialized for web version")
     
     def get_default_data(self):
         """Get default save data"""
-        return {
-            "coins": STARTING_COINS,
-            "owned_skins": ["default"],  # Start with default skin
-            "current_skin": "default"
-        }
+        return default_data()
     
     def load_data(self):
-        """Load save data - web version returns default"""
-        return self.get_default_data()
+        """Load save data from storage, default if there is none"""
+        try:
+            data = decode(self.storage.getItem(self.path))
+        except Exception as e:
+            print(f"Failed to load save data: {e}")
+            data = None
+        return data if data is not None else default_data()
     
     def save_data(self):
-        """Save current data - web version does nothing"""
-        pass  # No file I/O in web version
+        """Write the data after SAVE_DEBOUNCE seconds; changes made in the
+        meantime go out in the same write. setItem is synchronous, so this
+        keeps storage writes down to one per burst of changes."""
+        if self.flush_handle is not None:
+            return  # Already scheduled, and it will write the latest data
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()  # No frame loop running (scripts, tests): write now
+            return
+        self.flush_handle = loop.call_later(SAVE_DEBOUNCE, self.flush)
+    
+    def flush(self):
+        """Write the current data to storage now"""
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        try:
+            self.storage.setItem(self.path, encode(self.data))
+            self.writes += 1
+        except Exception as e:
+            print(f"Failed to save game data: {e}")
+    
+    def flush_pending(self):
+        """Write now if a debounced write is waiting"""
+        if self.flush_handle is not None:
+            self.flush()
+    
+    def close(self):
+        """Write any change still waiting for its debounced write"""
+        self.flush_pending()
+    
+    def change(self, record):
+        """Apply one change and schedule a write"""
+        apply_record(self.data, record)
+        self.save_data()
     
     def get_coins(self):
         return self.data.get("coins", STARTING_COINS)
     
     def add_coins(self, amount):
-        self.data["coins"] = self.data.get("coins", STARTING_COINS) + amount
-        self.save_data()
+        self.change({"op": "coins", "delta": amount})
     
     def spend_coins(self, amount):
         """Returns True if successful, False if not enough coins"""
         current_coins = self.data.get("coins", STARTING_COINS)
         if current_coins >= amount:
-            self.data["coins"] = current_coins - amount
-            self.save_data()
+            self.change({"op": "coins", "delta": -amount})
             return True
         return False
     
     def get_owned_skins(self):
-        return self.data.get("owned_skins", ["default"])
+        return self.data.get("owned_skins", ["white"])
     
     def buy_skin(self, skin_id):
         """Returns True if successful, False if already owned or not enough coins"""
@@ -55,19 +125,17 @@ class SaveSystem:
         
         price = PLAYER_SKINS[skin_id]["price"]
         if self.spend_coins(price):
-            self.data["owned_skins"].append(skin_id)
-            self.save_data()
+            self.change({"op": "buy", "skin": skin_id})
             return True
         return False
     
     def get_current_skin(self):
-        return self.data.get("current_skin", "default")
+        return self.data.get("current_skin", "white")
     
     def set_current_skin(self, skin_id):
         """Returns True if successful, False if not owned"""
         if skin_id in self.get_owned_skins():
-            self.data["current_skin"] = skin_id
-            self.save_data()
+            self.change({"op": "equip", "skin": skin_id})
             return True
         return False
 
@@ -2,14 +2,11 @@ import pygame
 import json
 import os
 from constants import *
+from fonts import render_text
 
 class Shop:
     def __init__(self, screen):
         self.screen = screen
-        self.font_title = pygame.font.Font(None, 64)
-        self.font_button = pygame.font.Font(None, 36)
-        self.font_price = pygame.font.Font(None, 32)
-        self.font_coin = pygame.font.Font(None, 36)
         
         # Shop items (player triangle colors)
         self.skins = [
@@ -149,12 +146,12 @@ class Shop:
             pygame.draw.circle(self.screen, (255, 255, 255), (x, y), 1)
         
         # Draw title
-        title_text = self.font_title.render("Shop", True, self.text_color)
+        title_text = render_text("Shop", 64, self.text_color)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 50))
         self.screen.blit(title_text, title_rect)
         
         # Draw coin counter
-        coin_text = self.font_coin.render(f"Coins: {coins}", True, self.coin_color)
+        coin_text = render_text(f"Coins: {coins}", 36, self.coin_color)
         coin_rect = coin_text.get_rect(topright=(SCREEN_WIDTH - 20, 20))
         self.screen.blit(coin_text, coin_rect)
         
@@ -162,7 +159,7 @@ class Shop:
         back_color = self.button_hover_color if self.hovered_back else self.button_color
         pygame.draw.rect(self.screen, back_color, self.back_button)
         pygame.draw.rect(self.screen, self.text_color, self.back_button, 2)
-        back_text = self.font_button.render("Back", True, self.text_color)
+        back_text = render_text("Back", 36, self.text_color)
         back_text_rect = back_text.get_rect(center=self.back_button.center)
         self.screen.blit(back_text, back_text_rect)
         
@@ -199,19 +196,19 @@ class Shop:
         pygame.draw.polygon(self.screen, self.text_color, triangle_points, 2)
         
         # Draw skin name
-        name_text = self.font_button.render(skin["name"], True, self.text_color)
+        name_text = render_text(skin["name"], 36, self.text_color)
         name_rect = name_text.get_rect(center=(item_rect.centerx, item_rect.bottom - 40))
         self.screen.blit(name_text, name_rect)
         
         # Draw price or status
         if index == self.selected_skin:
-            status_text = self.font_price.render("SELECTED", True, self.selected_color)
+            status_text = render_text("SELECTED", 32, self.selected_color)
         elif skin["owned"]:
-            status_text = self.font_price.render("OWNED", True, self.owned_color)
+            status_text = render_text("OWNED", 32, self.owned_color)
         elif coins >= skin["price"]:
-            status_text = self.font_price.render(f"{skin['price']} coins", True, self.coin_color)
+            status_text = render_text(f"{skin['price']} coins", 32, self.coin_color)
         else:
-            status_text = self.font_price.render(f"{skin['price']} coins", True, self.locked_color)
+            status_text = render_text(f"{skin['price']} coins", 32, self.locked_color)
         
         status_rect = status_text.get_rect(center=(item_rect.centerx, item_rect.bottom - 15))
         self.screen.blit(status_text, status_rect)
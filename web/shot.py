@@ -1,13 +1,7 @@
-import pygame
-from circleshape import CircleShape
+from entitystore import StoredShape
 from constants import SHOT_RADIUS
 
-class Shot(CircleShape):
+# Position and velocity live in Shot.store and are integrated in bulk
+class Shot(StoredShape):
     def __init__(self, x, y):
         super().__init__(x, y, SHOT_RADIUS)
-    
-    def draw(self, screen):
-        pygame.draw.circle(screen, "white", self.position, self.radius, 2)
-    
-    def update(self, dt):
-        self.position += self.velocity * dt
@@ -0,0 +1,17 @@
+import pygame
+
+# Pre-rendered surfaces (backgrounds, sprites, tiles) are blitted every
+# frame, so they are kept in the display's pixel format: blitting them is
+# then a plain copy instead of a per-pixel conversion.
+
+
+def to_display_format(surface, colorkey=None, alpha=False):
+    """surface in the display's pixel format (unchanged if there is no
+    display yet). alpha=True keeps per-pixel alpha; a colorkey makes that
+    colour transparent through an RLE colour key instead, which lets blits
+    skip whole runs of empty pixels (outlines are mostly empty)."""
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha() if alpha else surface.convert()
+    if colorkey is not None:
+        surface.set_colorkey(colorkey, pygame.RLEACCEL)
+    return surface